@@ -11,19 +11,32 @@
         ValueError: if matrix is not square
 """
 
+core = __import__('linalg_core')
+sparse = __import__('sparse_linalg')
 
-def determinant(matrix):
+
+def determinant(matrix, method="auto"):
     """
     Calculates the determinant of a matrix.
     Args:
-        matrix: list of lists representing a square matrix
+        matrix: list of lists representing a square matrix, or a
+                COO/CSR sparse dict (see sparse_linalg), which is
+                always factorized with sparse LU
+        method: "laplace" for the recursive cofactor expansion,
+                "lu" for partial-pivoted LU elimination (float),
+                "bareiss" for exact fraction-free elimination, or
+                "auto" to use "bareiss" when every entry is an int or
+                Fraction and "lu" otherwise
     Returns:
         The determinant value (int or float)
     Raises:
         TypeError: if matrix is not a list of lists
-        ValueError: if matrix is not square
+        ValueError: if matrix is not square or method is unknown
     """
 
+    if sparse.is_sparse(matrix):
+        return sparse.determinant(matrix)
+
     # --- Type checks ---
     if type(matrix) is not list:
         raise TypeError("matrix must be a list of lists")
@@ -43,16 +56,20 @@ def determinant(matrix):
     if not all(len(row) == rows for row in matrix):
         raise ValueError("matrix must be a square matrix")
 
+    if method not in ("auto", "laplace", "lu", "bareiss"):
+        raise ValueError("method must be one of "
+                         "'auto', 'laplace', 'lu' or 'bareiss'")
+
     # --- Base cases ---
     if rows == 1:
         return matrix[0][0]
     if rows == 2:
         return matrix[0][0]*matrix[1][1] - matrix[0][1]*matrix[1][0]
 
-    # --- Recursive Laplace expansion (first row) ---
-    det = 0
-    for col in range(rows):
-        minor = [row[:col] + row[col+1:] for row in matrix[1:]]
-        det += ((-1) ** col) * matrix[0][col] * determinant(minor)
-
-    return det
+    if method == "auto":
+        method = "bareiss" if core.is_exact(matrix) else "lu"
+    if method == "laplace":
+        return core.laplace_det(matrix)
+    if method == "bareiss":
+        return core.bareiss_det(matrix)
+    return core.lu_det(matrix)
@@ -3,33 +3,24 @@
 dule to calculate the minor matrix of a square matrix
 """
 
-
-def determinant(matrix):
-    """
-    Recursively calculates the determinant of a square matrix
-    """
-    if matrix == [[]]:
-        return 1
-
-    n = len(matrix)
-    if n == 1:
-        return matrix[0][0]
-    if n == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    det = 0
-    for col in range(n):
-        submatrix = [row[:col] + row[col + 1:] for row in matrix[1:]]
-        det += ((-1) ** col) * matrix[0][col] * determinant(submatrix)
-    return det
+core = __import__('linalg_core')
+determinant = core.determinant
+MinorCache = core.MinorCache
 
 
-def minor(matrix):
+def minor(matrix, cache=None):
     """
     Calculates the minor matrix of a square matrix
 
+    The minors are read off a single factorization of matrix
+    (see linalg_core.factorize) instead of one determinant per entry.
+    Passing a MinorCache switches to memoized cofactor expansion, which
+    never divides and so keeps int/Fraction minors exact; cache.stats
+    then reports the hit rate and peak number of entries.
+
     Args:
         matrix: list of lists representing a square matrix
+        cache: optional MinorCache for the memoized exact mode
 
     Returns:
         list of lists representing the minor matrix
@@ -38,26 +29,9 @@ def minor(matrix):
         TypeError: if matrix is not a list of lists
         ValueError: if matrix is not square or is empty
     """
-    if (type(matrix) is not list or
-            not all(type(row) is list for row in matrix)):
-        raise TypeError("matrix must be a list of lists")
-
-    n = len(matrix)
-    if n == 0 or matrix == [[]]:
-        raise ValueError("matrix must be a non-empty square matrix")
-    if not all(len(row) == n for row in matrix):
-        raise ValueError("matrix must be a non-empty square matrix")
-
-    if n == 1:
-        return [[1]]
-
-    minors = []
-    for i in range(n):
-        minor_row = []
-        for j in range(n):
-            submatrix = [row[:j] + row[j + 1:]
-                         for k, row in enumerate(matrix) if k != i]
-            minor_row.append(determinant(submatrix))
-        minors.append(minor_row)
-
-    return minors
+    core.check_matrix(matrix)
+    if cache is not None:
+        if len(matrix) == 1:
+            return [[1]]
+        return core.memo_minor(matrix, cache)
+    return core.minor(matrix)
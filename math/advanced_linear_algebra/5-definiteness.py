@@ -5,13 +5,77 @@ Module to calculate the definiteness of a matrix
 
 import numpy as np
 
+sparse = __import__('sparse_linalg')
 
-def definiteness(matrix):
+
+def _cholesky_ok(matrix):
+    """
+    Checks whether a Cholesky factorization of matrix succeeds with
+    pivots clear of rounding noise
+
+    A singular matrix can still factorize when rounding leaves a tiny
+    positive last pivot, so pivots within n * eps of the largest
+    diagonal entry are treated as inconclusive.
+    """
+    try:
+        chol = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        return False
+    pivots = np.diagonal(chol) ** 2
+    eps = np.finfo(float).eps
+    return pivots.min() > len(pivots) * eps * np.abs(matrix).max()
+
+
+def _sparse_definiteness(matrix, tol):
+    """
+    Classifies a sparse dict from the signs of its LDL^T pivots
+
+    Positive pivots of matrix - tol*I count the eigenvalues > tol and
+    negative pivots of matrix + tol*I those < -tol.
+    """
+    shape = tuple(matrix["shape"])
+    if len(shape) != 2 or shape[0] != shape[1] or shape[0] == 0:
+        return None
+    n = shape[0]
+    if not sparse.is_symmetric(sparse.to_rows(matrix)):
+        return None
+    upper = sparse.inertia(matrix, tol)
+    lower = upper if not tol else sparse.inertia(matrix, -tol)
+    if upper is None or lower is None:
+        return definiteness(np.array(sparse.to_dense(matrix), dtype=float),
+                            tol)
+    positive, negative = upper[0], lower[1]
+    if positive == n:
+        return "Positive definite"
+    if negative == n:
+        return "Negative definite"
+    if positive and negative:
+        return "Indefinite"
+    if negative == 0:
+        return "Positive semi-definite"
+    return "Negative semi-definite"
+
+
+def definiteness(matrix, tol=0.0):
     """
     Determines the definiteness of a square matrix
 
+    The symmetric matrix is classified in tiers, cheapest first:
+    mixed signs on the diagonal prove it indefinite without any
+    factorization, a successful Cholesky factorization of
+    matrix - tol*I (or of -matrix - tol*I) proves it positive
+    (negative) definite, and only then are the eigenvalues computed
+    with the symmetric solver eigvalsh.
+
+    A COO/CSR sparse dict (see sparse_linalg) is classified by the
+    inertia of sparse symmetric LDL^T eliminations of matrix - tol*I
+    and matrix + tol*I, falling back to the dense path when a zero
+    pivot turns up.
+
     Args:
-        matrix (np.ndarray): matrix to classify
+        matrix (np.ndarray): matrix to classify, or a sparse dict
+        tol (float): eigenvalues with absolute value <= tol count as
+            zero, so near-singular matrices classify as semi-definite
 
     Returns:
         str: "Positive definite", "Positive semi-definite",
@@ -20,7 +84,12 @@ def definiteness(matrix):
 
     Raises:
         TypeError: if matrix is not a numpy.ndarray
+        ValueError: if tol is negative
     """
+    if tol < 0:
+        raise ValueError("tol must be non-negative")
+    if sparse.is_sparse(matrix):
+        return _sparse_definiteness(matrix, tol)
     if not isinstance(matrix, np.ndarray):
         raise TypeError("matrix must be a numpy.ndarray")
 
@@ -34,8 +103,23 @@ def definiteness(matrix):
     if not np.allclose(matrix, matrix.T):
         return None
 
-    # Compute eigenvalues
-    eigvals = np.linalg.eigvals(matrix).real
+    # Diagonal entries are Rayleigh quotients e_i^T A e_i, so one above
+    # tol and one below -tol already means indefinite
+    diag = np.diagonal(matrix)
+    if np.any(diag > tol) and np.any(diag < -tol):
+        return "Indefinite"
+
+    # Cholesky succeeds exactly when every eigenvalue is > tol
+    shift = tol * np.eye(n)
+    if diag.min() > tol and _cholesky_ok(matrix - shift):
+        return "Positive definite"
+    if diag.max() < -tol and _cholesky_ok(-matrix - shift):
+        return "Negative definite"
+
+    # Symmetric eigen-solver for the remaining (semi-definite or
+    # indefinite) cases
+    eigvals = np.linalg.eigvalsh(matrix)
+    eigvals = np.where(np.abs(eigvals) <= tol, 0.0, eigvals)
 
     if np.all(eigvals > 0):
         return "Positive definite"
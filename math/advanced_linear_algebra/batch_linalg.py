@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Batched determinant, inverse and definiteness over stacks of matrices
+
+Each function takes an (N, n, n) numpy.ndarray and returns the N
+results from one vectorized call instead of a Python loop over
+0-determinant.py, 4-inverse.py and 5-definiteness.py.
+"""
+
+import numpy as np
+
+LABELS = ("Positive definite", "Positive semi-definite",
+          "Negative definite", "Negative semi-definite", "Indefinite")
+POSITIVE_DEFINITE = 0
+POSITIVE_SEMI_DEFINITE = 1
+NEGATIVE_DEFINITE = 2
+NEGATIVE_SEMI_DEFINITE = 3
+INDEFINITE = 4
+NOT_APPLICABLE = -1
+
+
+def check_stack(matrices):
+    """
+    Validates a stack of square matrices
+
+    Raises:
+        TypeError: if matrices is not a numpy.ndarray
+        ValueError: if matrices does not have shape (N, n, n)
+    """
+    if not isinstance(matrices, np.ndarray):
+        raise TypeError("matrices must be a numpy.ndarray")
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError("matrices must have shape (N, n, n)")
+
+
+def batch_determinant(matrices):
+    """
+    Determinant of every matrix in a stack
+
+    Args:
+        matrices (np.ndarray): shape (N, n, n)
+
+    Returns:
+        np.ndarray: shape (N,), 0.0 for singular matrices
+    """
+    check_stack(matrices)
+    if matrices.shape[1] == 0:
+        return np.ones(matrices.shape[0])
+    return np.linalg.det(matrices)
+
+
+def batch_inverse(matrices):
+    """
+    Inverse of every matrix in a stack
+
+    Singular matrices do not raise; their slot is filled with NaN.
+
+    Args:
+        matrices (np.ndarray): shape (N, n, n)
+
+    Returns:
+        np.ndarray: shape (N, n, n) of inverses, NaN where singular
+    """
+    check_stack(matrices)
+    N, n, _ = matrices.shape
+    out = np.full((N, n, n), np.nan)
+    if N == 0 or n == 0:
+        return out
+
+    # slogdet and inv share the same LU factorization, so a zero sign
+    # marks exactly the matrices inv would reject
+    sign, _ = np.linalg.slogdet(matrices)
+    ok = (sign != 0) & np.all(np.isfinite(matrices), axis=(1, 2))
+    if np.any(ok):
+        try:
+            out[ok] = np.linalg.inv(matrices[ok])
+        except np.linalg.LinAlgError:
+            for i in np.flatnonzero(ok):
+                try:
+                    out[i] = np.linalg.inv(matrices[i])
+                except np.linalg.LinAlgError:
+                    pass
+    return out
+
+
+def batch_definiteness(matrices, codes=False):
+    """
+    Definiteness of every matrix in a stack
+
+    Uses the same rules as 5-definiteness.py: non-symmetric matrices
+    are not applicable, the rest are classified by the signs of their
+    eigenvalues (computed with the symmetric solver, eigvalsh).
+
+    Args:
+        matrices (np.ndarray): shape (N, n, n)
+        codes (bool): return integer codes (index into LABELS, or
+            NOT_APPLICABLE) instead of labels
+
+    Returns:
+        np.ndarray: shape (N,) of labels (object dtype, None when not
+        applicable) or of int codes
+    """
+    check_stack(matrices)
+    N, n, _ = matrices.shape
+    result = np.full(N, NOT_APPLICABLE, dtype=int)
+    if N and n:
+        sym = np.all(np.isclose(matrices, np.swapaxes(matrices, 1, 2)),
+                     axis=(1, 2))
+        if np.any(sym):
+            eig = np.linalg.eigvalsh(matrices[sym])
+            pos = np.all(eig > 0, axis=1)
+            nonneg = np.all(eig >= 0, axis=1)
+            neg = np.all(eig < 0, axis=1)
+            nonpos = np.all(eig <= 0, axis=1)
+            mixed = np.any(eig > 0, axis=1) & np.any(eig < 0, axis=1)
+            sub = np.select(
+                [pos, nonneg, neg, nonpos, mixed],
+                [POSITIVE_DEFINITE, POSITIVE_SEMI_DEFINITE,
+                 NEGATIVE_DEFINITE, NEGATIVE_SEMI_DEFINITE, INDEFINITE],
+                default=NOT_APPLICABLE)
+            result[sym] = sub
+
+    if codes:
+        return result
+    labels = np.empty(N, dtype=object)
+    for code, label in enumerate(LABELS):
+        labels[result == code] = label
+    return labels
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the determinant methods in 0-determinant.py
+
+Compares the recursive Laplace expansion with the LU and Bareiss
+elimination paths on random integer and float matrices up to n=200.
+The Laplace expansion is O(n!) and is only timed up to LAPLACE_MAX.
+"""
+
+import random
+import time
+
+determinant = __import__('0-determinant').determinant
+
+SIZES = [3, 5, 7, 8, 9, 10, 25, 50, 100, 200]
+LAPLACE_MAX = 9
+
+
+def timed(fn, *args):
+    """
+    Returns the wall time in seconds of a single call to fn(*args)
+    """
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Prints one line per matrix size with the time of each method
+    """
+    random.seed(0)
+    print("{:>5} {:>12} {:>12} {:>12}".format(
+        "n", "laplace", "lu", "bareiss"))
+    for n in SIZES:
+        ints = [[random.randint(-9, 9) for _ in range(n)] for _ in range(n)]
+        floats = [[random.uniform(-1, 1) for _ in range(n)]
+                  for _ in range(n)]
+        if n <= LAPLACE_MAX:
+            t_laplace = "{:12.5f}".format(timed(determinant, ints, "laplace"))
+        else:
+            t_laplace = "{:>12}".format("skipped")
+        t_lu = timed(determinant, floats, "lu")
+        t_bareiss = timed(determinant, ints, "bareiss")
+        print("{:>5} {} {:12.5f} {:12.5f}".format(
+            n, t_laplace, t_lu, t_bareiss))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the sparse paths of determinant, inverse and definiteness
+
+Builds a symmetric, diagonally dominant banded matrix (10 non-zeros per
+row, 0.1% density at n=10000) with its rows and columns shuffled, so the
+RCM reordering has to recover the band. The dense numpy path is timed
+on the same matrices up to DENSE_MAX; pass --dense to time it at every
+size (n=10000 needs about 800MB).
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+determinant = __import__('0-determinant').determinant
+inverse = __import__('4-inverse').inverse
+definiteness = __import__('5-definiteness').definiteness
+sparse = __import__('sparse_linalg')
+
+SIZES = [1000, 2000, 5000, 10000]
+INVERSE_MAX = 1000
+DENSE_MAX = 2000
+HALF_BAND = 5
+
+
+def banded(n, seed=0):
+    """
+    Shuffled symmetric banded COO dict with about 2 * HALF_BAND
+    non-zeros per row
+    """
+    rng = random.Random(seed)
+    perm = list(range(n))
+    rng.shuffle(perm)
+    row, col, data = [], [], []
+    for i in range(n):
+        for j in range(i + 1, min(n, i + HALF_BAND)):
+            value = rng.uniform(-0.1, 0.1)
+            row += [perm[i], perm[j]]
+            col += [perm[j], perm[i]]
+            data += [value, value]
+        row.append(perm[i])
+        col.append(perm[i])
+        data.append(1.0)
+    return {"shape": (n, n), "row": row, "col": col, "data": data}
+
+
+def timed(fn, *args):
+    """
+    Returns the wall time in seconds of a single call to fn(*args)
+    """
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Prints sparse and dense timings for each size
+    """
+    dense_max = max(SIZES) if "--dense" in sys.argv else DENSE_MAX
+    print("{:>6} {:>9} {:>11} {:>11} {:>11} {:>11} {:>11}".format(
+        "n", "density", "det", "inverse", "definite", "dense det",
+        "dense def"))
+    for n in SIZES:
+        matrix = banded(n)
+        density = len(matrix["data"]) / float(n * n)
+        t_det = timed(determinant, matrix)
+        t_def = timed(definiteness, matrix)
+        t_inv = "{:11.3f}".format(timed(inverse, matrix)) \
+            if n <= INVERSE_MAX else "{:>11}".format("skipped")
+        if n <= dense_max:
+            dense = np.array(sparse.to_dense(matrix), dtype=float)
+            t_ddet = "{:11.3f}".format(timed(np.linalg.det, dense))
+            t_ddef = "{:11.3f}".format(timed(definiteness, dense))
+        else:
+            t_ddet = t_ddef = "{:>11}".format("skipped")
+        print("{:>6} {:9.4%} {:11.3f} {} {:11.3f} {} {}".format(
+            n, density, t_det, t_inv, t_def, t_ddet, t_ddef))
+
+
+if __name__ == "__main__":
+    main()
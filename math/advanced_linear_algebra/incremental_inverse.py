@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Module keeping the inverse and determinant of a matrix up to date
+under rank-1 changes
+"""
+
+core = __import__('linalg_core')
+
+
+class IncrementalInverse:
+    """
+    Tracks a matrix together with its inverse and determinant
+
+    The starting point (and every refactorization) comes from the same
+    single factorization 4-inverse.py uses (linalg_core.factorize).
+
+    Rank-1 changes A + u v^T, including replacing one row or one column,
+    are folded in with the Sherman-Morrison formula and the matrix
+    determinant lemma in O(n^2) instead of a fresh O(n^3) inverse:
+        (A + u v^T)^-1 = A^-1 - (A^-1 u)(v^T A^-1) / (1 + v^T A^-1 u)
+        det(A + u v^T) = det(A) * (1 + v^T A^-1 u)
+
+    Rounding drift is bounded by refactorizing from scratch every
+    refactor_every updates, or sooner when a residual check of one row
+    of A A^-1 against the identity exceeds drift_tol.
+
+    Attributes:
+        refactor_every (int): updates between forced refactorizations
+        drift_tol (float): largest residual tolerated before refactoring
+        updates (int): updates applied since the last refactorization
+        refactors (int): number of refactorizations so far
+    """
+
+    def __init__(self, matrix, refactor_every=50, drift_tol=1e-8):
+        """
+        Args:
+            matrix: list of lists representing a square matrix
+            refactor_every (int): updates between forced refactorizations
+            drift_tol (float): residual that triggers a refactorization
+
+        Raises:
+            TypeError: if matrix is not a list of lists
+            ValueError: if matrix is not square or is empty
+        """
+        core.check_matrix(matrix)
+        if type(refactor_every) is not int or refactor_every < 1:
+            raise ValueError("refactor_every must be a positive integer")
+        self.refactor_every = refactor_every
+        self.drift_tol = drift_tol
+        self.refactors = 0
+        self.__matrix = [[float(x) for x in row] for row in matrix]
+        self.refactor()
+
+    @property
+    def matrix(self):
+        """
+        Copy of the current matrix
+        """
+        return [list(row) for row in self.__matrix]
+
+    @property
+    def inverse(self):
+        """
+        Copy of the current inverse, or None if the matrix is singular
+        """
+        if self.__inverse is None:
+            return None
+        return [list(row) for row in self.__inverse]
+
+    @property
+    def determinant(self):
+        """
+        Current determinant
+        """
+        return self.__det
+
+    def refactor(self):
+        """
+        Recomputes the inverse and determinant from scratch
+        """
+        self.__det, _, self.__inverse = core.factorize(self.__matrix,
+                                                       need_adj=False)
+        self.updates = 0
+        self.refactors += 1
+
+    def rank1_update(self, u, v):
+        """
+        Replaces the matrix A with A + u v^T
+
+        Args:
+            u (list): column vector of length n
+            v (list): row vector of length n
+
+        Raises:
+            ValueError: if u or v does not have length n
+        """
+        n = len(self.__matrix)
+        if len(u) != n or len(v) != n:
+            raise ValueError("u and v must have length {}".format(n))
+        for i in range(n):
+            if u[i]:
+                row = self.__matrix[i]
+                for j in range(n):
+                    row[j] += u[i] * v[j]
+        self.__apply(u, v)
+
+    def update_row(self, i, row):
+        """
+        Replaces row i of the matrix with row
+
+        Raises:
+            ValueError: if row does not have length n
+        """
+        n = len(self.__matrix)
+        if len(row) != n:
+            raise ValueError("row must have length {}".format(n))
+        old = self.__matrix[i]
+        v = [row[j] - old[j] for j in range(n)]
+        self.__matrix[i] = [float(x) for x in row]
+        u = [0.0] * n
+        u[i] = 1.0
+        self.__apply(u, v)
+
+    def update_column(self, j, column):
+        """
+        Replaces column j of the matrix with column
+
+        Raises:
+            ValueError: if column does not have length n
+        """
+        n = len(self.__matrix)
+        if len(column) != n:
+            raise ValueError("column must have length {}".format(n))
+        u = [column[i] - self.__matrix[i][j] for i in range(n)]
+        for i in range(n):
+            self.__matrix[i][j] = float(column[i])
+        v = [0.0] * n
+        v[j] = 1.0
+        self.__apply(u, v)
+
+    def __apply(self, u, v):
+        """
+        Folds A + u v^T into the stored inverse and determinant, with the
+        matrix itself already updated
+        """
+        inv = self.__inverse
+        self.updates += 1
+        if inv is None or self.updates >= self.refactor_every:
+            self.refactor()
+            return
+
+        n = len(inv)
+        # x = A^-1 u, y = v^T A^-1
+        x = [sum(inv[i][k] * u[k] for k in range(n) if u[k])
+             for i in range(n)]
+        y = [0.0] * n
+        for k in range(n):
+            if v[k]:
+                inv_row = inv[k]
+                for j in range(n):
+                    y[j] += v[k] * inv_row[j]
+        denom = 1.0 + sum(v[k] * x[k] for k in range(n))
+
+        if abs(denom) <= 1e-12:
+            # Updated matrix is (numerically) singular
+            self.refactor()
+            return
+
+        for i in range(n):
+            if x[i]:
+                factor = x[i] / denom
+                inv_row = inv[i]
+                for j in range(n):
+                    inv_row[j] -= factor * y[j]
+        self.__det *= denom
+
+        if self.__residual(self.updates % n) > self.drift_tol:
+            self.refactor()
+
+    def __residual(self, i):
+        """
+        Largest deviation of row i of A A^-1 from the identity, O(n^2)
+        """
+        inv = self.__inverse
+        n = len(inv)
+        row = self.__matrix[i]
+        worst = 0.0
+        for j in range(n):
+            value = sum(row[k] * inv[k][j] for k in range(n))
+            worst = max(worst, abs(value - (1.0 if i == j else 0.0)))
+        return worst
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Shared linear algebra core for the advanced_linear_algebra entry points
+
+0-determinant.py through 4-inverse.py all import from this module. The
+matrix is factorized once with Gauss-Jordan elimination and the
+determinant, inverse, adjugate (det * A^-1), cofactor and minor matrices
+are all derived from that single O(n^3) pass.
+
+Matrices whose entries are all int or Fraction go through fraction-free
+(Bareiss) elimination so their results stay exact; anything else goes
+through partial-pivoted float elimination.
+"""
+
+from collections import OrderedDict
+from fractions import Fraction
+
+
+def check_matrix(matrix):
+    """
+    Validates a non-empty square list of lists
+
+    Raises:
+        TypeError: if matrix is not a list of lists
+        ValueError: if matrix is not square or is empty
+    """
+    if (type(matrix) is not list or
+            not all(type(row) is list for row in matrix)):
+        raise TypeError("matrix must be a list of lists")
+
+    n = len(matrix)
+    if n == 0 or matrix == [[]]:
+        raise ValueError("matrix must be a non-empty square matrix")
+    if not all(len(row) == n for row in matrix):
+        raise ValueError("matrix must be a non-empty square matrix")
+
+
+def is_exact(matrix):
+    """
+    Checks whether every entry of matrix is an int or a Fraction
+    """
+    return all(type(x) in (int, Fraction) for row in matrix for x in row)
+
+
+def _exact_rows(matrix):
+    """
+    Copies matrix, promoting to Fraction unless every entry is an int
+
+    Returns:
+        (rows, exact_int)
+    """
+    exact_int = all(type(x) is int for row in matrix for x in row)
+    if exact_int:
+        return [list(row) for row in matrix], True
+    return [[Fraction(x) for x in row] for row in matrix], False
+
+
+def laplace_det(matrix):
+    """
+    Recursive Laplace expansion along the first row, O(n!)
+    """
+    rows = len(matrix)
+    if rows == 1:
+        return matrix[0][0]
+    if rows == 2:
+        return matrix[0][0]*matrix[1][1] - matrix[0][1]*matrix[1][0]
+
+    det = 0
+    for col in range(rows):
+        minor = [row[:col] + row[col+1:] for row in matrix[1:]]
+        det += ((-1) ** col) * matrix[0][col] * laplace_det(minor)
+
+    return det
+
+
+def lu_det(matrix):
+    """
+    Determinant by Gaussian elimination with partial pivoting, O(n^3)
+
+    The product of the pivots of the LU factorization, with the sign
+    flipped once per row swap.
+    """
+    n = len(matrix)
+    a = [[float(x) for x in row] for row in matrix]
+    det = 1.0
+    for k in range(n):
+        # --- Partial pivoting: largest magnitude in column k ---
+        p = max(range(k, n), key=lambda i: abs(a[i][k]))
+        if a[p][k] == 0:
+            return 0.0
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+            det = -det
+        pivot_row = a[k]
+        pivot = pivot_row[k]
+        det *= pivot
+        for i in range(k + 1, n):
+            row = a[i]
+            factor = row[k] / pivot
+            if factor == 0:
+                continue
+            for j in range(k + 1, n):
+                row[j] -= factor * pivot_row[j]
+    return det
+
+
+def bareiss_det(matrix):
+    """
+    Fraction-free Bareiss elimination, O(n^3) exact arithmetic
+
+    Every intermediate value is itself a minor of the input, so integer
+    matrices stay integer and the result is exact.
+    """
+    n = len(matrix)
+    a, exact_int = _exact_rows(matrix)
+    sign = 1
+    prev = 1
+    for k in range(n - 1):
+        # --- Swap in a non-zero pivot if needed ---
+        if a[k][k] == 0:
+            for i in range(k + 1, n):
+                if a[i][k] != 0:
+                    a[k], a[i] = a[i], a[k]
+                    sign = -sign
+                    break
+            else:
+                return 0
+        pivot_row = a[k]
+        pivot = pivot_row[k]
+        for i in range(k + 1, n):
+            row = a[i]
+            for j in range(k + 1, n):
+                num = row[j] * pivot - row[k] * pivot_row[j]
+                row[j] = num // prev if exact_int else num / prev
+        prev = pivot
+    return sign * a[n - 1][n - 1]
+
+
+def determinant(matrix):
+    """
+    Determinant of a validated, non-empty square matrix
+
+    Uses bareiss_det for exact matrices and lu_det otherwise.
+    """
+    n = len(matrix)
+    if n == 1:
+        return matrix[0][0]
+    if n == 2:
+        return matrix[0][0]*matrix[1][1] - matrix[0][1]*matrix[1][0]
+    if is_exact(matrix):
+        return bareiss_det(matrix)
+    return lu_det(matrix)
+
+
+def _bareiss_adjugate(matrix):
+    """
+    Fraction-free Gauss-Jordan elimination of [A | I]
+
+    Reducing [A | I] with Bareiss steps leaves [d*I | d*A^-1] where
+    d = det(PA) for the row permutation P, so the right block is the
+    adjugate up to the permutation sign. Every entry is a minor of the
+    augmented matrix, so integer input stays integer.
+
+    Returns:
+        (det, adj), or (0, None) if matrix is singular
+    """
+    n = len(matrix)
+    rows, exact_int = _exact_rows(matrix)
+    zero, one = (0, 1) if exact_int else (Fraction(0), Fraction(1))
+    a = [row + [one if j == i else zero for j in range(n)]
+         for i, row in enumerate(rows)]
+    width = 2 * n
+    sign = 1
+    prev = one
+    for k in range(n):
+        if a[k][k] == 0:
+            for i in range(k + 1, n):
+                if a[i][k] != 0:
+                    a[k], a[i] = a[i], a[k]
+                    sign = -sign
+                    break
+            else:
+                return 0, None
+        pivot_row = a[k]
+        pivot = pivot_row[k]
+        for i in range(n):
+            if i == k:
+                continue
+            row = a[i]
+            factor = row[k]
+            for j in range(width):
+                num = row[j] * pivot - factor * pivot_row[j]
+                row[j] = num // prev if exact_int else num / prev
+        prev = pivot
+    det = sign * prev
+    adj = [[sign * x for x in row[n:]] for row in a]
+    return det, adj
+
+
+def _float_inverse(matrix):
+    """
+    Gauss-Jordan elimination of [A | I] with partial pivoting
+
+    Returns:
+        (det, inv), or (0.0, None) if matrix is singular
+    """
+    n = len(matrix)
+    a = [[float(x) for x in row] + [1.0 if j == i else 0.0
+                                    for j in range(n)]
+         for i, row in enumerate(matrix)]
+    width = 2 * n
+    det = 1.0
+    for k in range(n):
+        p = max(range(k, n), key=lambda i: abs(a[i][k]))
+        if a[p][k] == 0:
+            return 0.0, None
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+            det = -det
+        pivot = a[k][k]
+        det *= pivot
+        pivot_row = [x / pivot for x in a[k]]
+        a[k] = pivot_row
+        for i in range(n):
+            if i == k:
+                continue
+            row = a[i]
+            factor = row[k]
+            if factor == 0:
+                continue
+            for j in range(k, width):
+                row[j] -= factor * pivot_row[j]
+    return det, [row[n:] for row in a]
+
+
+def _direct_minors(matrix):
+    """
+    Minor matrix with one O(n^3) determinant per entry
+
+    Fallback for singular matrices, whose minors cannot be read off an
+    inverse.
+    """
+    n = len(matrix)
+    minors = []
+    for i in range(n):
+        minor_row = []
+        for j in range(n):
+            submatrix = [row[:j] + row[j + 1:]
+                         for k, row in enumerate(matrix) if k != i]
+            minor_row.append(determinant(submatrix))
+        minors.append(minor_row)
+    return minors
+
+
+def factorize(matrix, need_adj=True):
+    """
+    Factorizes a validated, non-empty square matrix once
+
+    The adjugate of a singular matrix cannot be read off an inverse and
+    costs n^2 determinants (_direct_minors), so it is only built when
+    need_adj is set; otherwise adj is None for a singular matrix.
+
+    Returns:
+        (det, adj, inv) where adj is the adjugate and inv the inverse as
+        lists of lists; inv is None when matrix is singular. For exact
+        matrices det and adj are exact and inv is adj / det.
+    """
+    n = len(matrix)
+    if n == 1:
+        det = matrix[0][0]
+        return det, [[1]], None if det == 0 else [[1 / det]]
+
+    if is_exact(matrix):
+        det, adj = _bareiss_adjugate(matrix)
+        if adj is None:
+            if not need_adj:
+                return det, None, None
+            return det, _adjugate_of(_direct_minors(matrix)), None
+        return det, adj, [[x / det for x in row] for row in adj]
+
+    det, inv = _float_inverse(matrix)
+    if inv is None:
+        if not need_adj:
+            return det, None, None
+        return det, _adjugate_of(_direct_minors(matrix)), None
+    adj = [[det * x for x in row] for row in inv]
+    return det, adj, inv
+
+
+def _adjugate_of(minors):
+    """
+    Adjugate (transposed cofactor matrix) from a minor matrix
+    """
+    n = len(minors)
+    return [[((-1) ** (i + j)) * minors[j][i] for j in range(n)]
+            for i in range(n)]
+
+
+class CacheStats:
+    """
+    Counters reported by a MinorCache
+
+    Attributes:
+        hits (int): lookups answered from the cache
+        misses (int): lookups that had to be computed
+        evictions (int): entries dropped to stay within maxsize
+        peak_entries (int): largest number of entries held at once
+    """
+
+    def __init__(self):
+        """
+        Starts every counter at zero
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_entries = 0
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of lookups answered from the cache (0.0 if none yet)
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        """
+        Summary of the counters
+        """
+        return ("CacheStats(hits={}, misses={}, evictions={}, "
+                "peak_entries={}, hit_rate={:.3f})").format(
+                    self.hits, self.misses, self.evictions,
+                    self.peak_entries, self.hit_rate)
+
+
+class MinorCache:
+    """
+    Bounded LRU cache of sub-determinants
+
+    Entries are keyed by (row mask, column mask): bit i of each mask is
+    set when row/column i of the original matrix belongs to the
+    sub-matrix, so the entries only hold for one matrix: memo_minor
+    binds the cache to its matrix, and binding it to different values
+    drops the entries.
+
+    Attributes:
+        maxsize (int): maximum number of entries kept
+        stats (CacheStats): hit/miss/eviction counters
+    """
+
+    def __init__(self, maxsize=65536):
+        """
+        Args:
+            maxsize (int): maximum number of entries kept, at least 1
+
+        Raises:
+            ValueError: if maxsize is not a positive int
+        """
+        if type(maxsize) is not int or maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._data = OrderedDict()
+        self._matrix = None
+
+    def __len__(self):
+        """
+        Number of entries currently held
+        """
+        return len(self._data)
+
+    def clear(self):
+        """
+        Drops every entry and resets the stats
+        """
+        self._data.clear()
+        self.stats = CacheStats()
+        self._matrix = None
+
+    def bind(self, matrix):
+        """
+        Ties the cache to matrix, dropping the entries first when they
+        were computed for other values (another matrix, or this one
+        since modified in place); the stats keep counting
+        """
+        values = tuple(tuple(row) for row in matrix)
+        if values != self._matrix:
+            self._data.clear()
+            self._matrix = values
+
+    def get(self, key):
+        """
+        Returns the cached value for key, or None on a miss
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Stores value under key, evicting the least recently used entry
+        when the cache is full
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+        if len(self._data) > self.stats.peak_entries:
+            self.stats.peak_entries = len(self._data)
+
+
+def _memo_det(matrix, rows, cols, cache):
+    """
+    Laplace expansion of the sub-matrix selected by two bitmasks
+
+    Expands along the lowest selected row; every sub-determinant is
+    looked up in (and stored into) cache, so sub-minors shared between
+    expansions are computed once while they stay cached.
+    """
+    r = (rows & -rows).bit_length() - 1
+    if rows == 1 << r:
+        return matrix[r][cols.bit_length() - 1]
+
+    key = (rows, cols)
+    det = cache.get(key)
+    if det is not None:
+        return det
+
+    sub_rows = rows & ~(1 << r)
+    row = matrix[r]
+    det = 0
+    sign = 1
+    c_bits = cols
+    while c_bits:
+        bit = c_bits & -c_bits
+        c_bits ^= bit
+        value = row[bit.bit_length() - 1]
+        if value:
+            det += sign * value * _memo_det(matrix, sub_rows,
+                                            cols ^ bit, cache)
+        sign = -sign
+    cache.put(key, det)
+    return det
+
+
+def memo_minor(matrix, cache):
+    """
+    Minor matrix by memoized cofactor expansion
+
+    Stays combinatorial (no division), so exact int or Fraction input
+    gives exact minors, but shares sub-minors between entries through
+    cache (a MinorCache), which is bound to matrix first.
+    """
+    cache.bind(matrix)
+    n = len(matrix)
+    full = (1 << n) - 1
+    return [[_memo_det(matrix, full ^ (1 << i), full ^ (1 << j), cache)
+             for j in range(n)] for i in range(n)]
+
+
+def minor(matrix):
+    """
+    Minor matrix of a validated, non-empty square matrix
+    """
+    adj = factorize(matrix)[1]
+    n = len(adj)
+    return [[((-1) ** (i + j)) * adj[j][i] for j in range(n)]
+            for i in range(n)]
+
+
+def cofactor(matrix):
+    """
+    Cofactor matrix of a validated, non-empty square matrix
+    """
+    adj = factorize(matrix)[1]
+    return [list(row) for row in zip(*adj)]
+
+
+def adjugate(matrix):
+    """
+    Adjugate matrix of a validated, non-empty square matrix
+    """
+    return factorize(matrix)[1]
+
+
+def inverse(matrix):
+    """
+    Inverse of a validated, non-empty square matrix, or None if singular
+    """
+    return factorize(matrix, need_adj=False)[2]
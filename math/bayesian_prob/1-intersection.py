@@ -2,6 +2,8 @@
 """Module for calculating intersection of obtaining data with prior beliefs"""
 import numpy as np
 
+kernels = __import__('log_kernels')
+
 
 def intersection(x, n, P, Pr):
     """
@@ -25,42 +27,20 @@ def intersection(x, n, P, Pr):
     ValueError: If any value in Pr is not in range [0, 1]
     ValueError: If Pr does not sum to 1
     """
-    # Validate n
-    if not isinstance(n, int) or n <= 0:
-        raise ValueError("n must be a positive integer")
-    # Validate x
-    if not isinstance(x, int) or x < 0:
-        raise ValueError(
-            "x must be an integer that is greater than or equal to 0"
-        )
-    # Validate x <= n
-    if x > n:
-        raise ValueError("x cannot be greater than n")
-    # Validate P is a 1D numpy array
-    if not isinstance(P, np.ndarray) or P.ndim != 1:
-        raise TypeError("P must be a 1D numpy.ndarray")
-    # Validate Pr is a numpy array with same shape as P
-    if not isinstance(Pr, np.ndarray) or Pr.shape != P.shape:
-        raise TypeError("Pr must be a numpy.ndarray with the same shape as P")
-    # Validate all values in P are in range [0, 1]
-    if np.any(P < 0) or np.any(P > 1):
-        raise ValueError("All values in P must be in the range [0, 1]")
-    # Validate all values in Pr are in range [0, 1]
-    if np.any(Pr < 0) or np.any(Pr > 1):
-        raise ValueError("All values in Pr must be in the range [0, 1]")
-    # Validate Pr sums to 1
-    if not np.isclose(np.sum(Pr), 1):
-        raise ValueError("Pr must sum to 1")
-    # Calculate binomial coefficient: C(n, x) = n! / (x! * (n-x)!)
-    A = np.math.factorial(n)
-    B = (np.math.factorial(x) * np.math.factorial(n - x))
-    binomial_coef = A / B
-    # binomial_coef = np.math.factorial(n) /
-    # (np.math.factorial(x) * np.math.factorial(n - x))
-    # Calculate likelihood using binomial probability formula:
-    # L(P|x,n) = C(n,x) * P^x * (1-P)^(n-x)
-    likelihood_values = binomial_coef * (P ** x) * ((1 - P) ** (n - x))
-    # Calculate intersection: Likelihood * Prior
-    # P(x,n ∩ P) = P(x,n|P) * P(P) = Likelihood * Prior
-    intersection_values = likelihood_values * Pr
-    return intersection_values
+    return np.exp(log_intersection(x, n, P, Pr))
+
+
+def log_intersection(x, n, P, Pr):
+    """
+    Calculates the log of intersection(x, n, P, Pr), -inf where it is 0
+
+    The log-likelihood (see 0-likelihood.log_likelihood) plus
+    log(Pr), so intersections far below the smallest float stay
+    representable.
+    x and n may also be 1D integer arrays of k observations, giving
+    one row per observation.
+    Raises the same errors as intersection.
+    """
+    x, n = kernels.validate(x, n, P, Pr)
+    # log P(x,n ∩ P) = log L(P|x,n) + log P(P)
+    return kernels.log_likelihood(x, n, P) + kernels.log_prior(Pr)
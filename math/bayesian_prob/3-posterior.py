@@ -2,6 +2,8 @@
 """Module for calculating posterior probability"""
 import numpy as np
 
+kernels = __import__('log_kernels')
+
 
 def posterior(x, n, P, Pr):
     """
@@ -15,16 +17,55 @@ def posterior(x, n, P, Pr):
     Returns:
         The posterior probability of each probability in P given x and n
     """
-    # Import the intersection and marginal functions
-    intersection = __import__('1-intersection').intersection
-    marginal = __import__('2-marginal').marginal
-    # Calculate the intersection for all probabilities
-    # This handles all validation internally
-    intersection_values = intersection(x, n, P, Pr)
-    # Calculate the marginal probability (evidence)
-    marginal_prob = marginal(x, n, P, Pr)
-    # Calculate posterior using Bayes' theorem:
-    # P(p|x,n) = P(x,n|p) * P(p) / P(x,n)
-    #          = intersection / marginal
-    posterior_prob = intersection_values / marginal_prob
-    return posterior_prob
+    return np.exp(log_posterior(x, n, P, Pr))
+
+
+def log_posterior(x, n, P, Pr):
+    """
+    Calculates the log of posterior(x, n, P, Pr), -inf where it is 0
+
+    The log intersections minus their log-sum-exp, so the posterior
+    stays normalised for n large enough that every intersection
+    underflows to 0 (where intersection / marginal would be 0 / 0).
+    Raises the same errors as 1-intersection.intersection.
+    """
+    return log_update(x, n, P, Pr)[3]
+
+
+def log_update(x, n, P, Pr):
+    """
+    Log likelihood, intersection, marginal and posterior in one pass
+
+    The inputs are validated once and the log-likelihood over P is
+    computed once, then the other three are derived from it; x and n
+    may be 1D integer arrays of k observations, each updated
+    independently against the same prior grid.
+    Args:
+        x, n, P, Pr: as for posterior
+    Returns:
+        log likelihood, log intersection and log posterior with shape
+        P.shape (or (k, len(P)) for a batch), and the log marginal, a
+        float (or shape (k,))
+    Raises the same errors as 1-intersection.intersection.
+    """
+    x, n = kernels.validate(x, n, P, Pr)
+    log_like = kernels.log_likelihood(x, n, P)
+    log_int = log_like + kernels.log_prior(Pr)
+    log_marg = kernels.logsumexp(log_int, axis=-1)
+    # Bayes' theorem in log space:
+    # log P(p|x,n) = log P(x,n ∩ p) - log Σ P(x,n ∩ p)
+    log_post = log_int - np.expand_dims(log_marg, -1)
+    return log_like, log_int, log_marg, log_post
+
+
+def update(x, n, P, Pr):
+    """
+    Calculates the likelihood, intersection, marginal and posterior
+    together, sharing one validation and one likelihood evaluation
+    Args:
+        x, n, P, Pr: as for posterior; x and n may be 1D integer arrays
+            of k observations (see log_update)
+    Returns:
+        likelihood, intersection, marginal, posterior
+    """
+    return tuple(np.exp(v) for v in log_update(x, n, P, Pr))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cost and range of the log-space likelihood against the factorial one
+
+The factorial column is the previous implementation (a big-int C(n, x)
+times P^x * (1 - P)^(n - x)); it is skipped once it would take too
+long. For each n the table gives both times on an 11-point grid and
+the marginal each yields; the factorial C(n, x) overflows a float
+once it passes about 1e308.
+"""
+
+
+import time
+from math import factorial
+
+import numpy as np
+
+likelihood = __import__('0-likelihood').likelihood
+log_marginal = __import__('2-marginal').log_marginal
+
+SLOW_MAX = 100000
+
+
+def factorial_likelihood(x, n, P):
+    """The previous factorial-based likelihood"""
+    coef = factorial(n) / (factorial(x) * factorial(n - x))
+    return coef * (P ** x) * ((1 - P) ** (n - x))
+
+
+def timed(fn, *args):
+    """Wall time in seconds of one call, and the result"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Times both likelihoods over growing n at x = n / 5"""
+    P = np.linspace(0, 1, 11)
+    Pr = np.ones(11) / 11
+    print("{:>9} {:>12} {:>12} {:>14} {:>14} {:>14}".format(
+        "n", "factorial s", "log s", "marginal (f)", "marginal", "log marg"))
+    for n in (130, 1000, 10000, 100000, 1000000):
+        x = n // 5
+        if n <= SLOW_MAX:
+            try:
+                t_fact, ref = timed(factorial_likelihood, x, n, P)
+                fact = "{:14.6e}".format(np.sum(ref * Pr))
+            except OverflowError:
+                t_fact, fact = float('nan'), "{:>14}".format("overflow")
+        else:
+            t_fact, fact = float('nan'), "{:>14}".format("-")
+        t_log, out = timed(likelihood, x, n, P)
+        print("{:9d} {:12.6f} {:12.6f} {} {:14.6e} {:14.6f}".format(
+            n, t_fact, t_log, fact, np.sum(out * Pr),
+            log_marginal(x, n, P, Pr)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cost of the streaming update against recomputing from the totals
+
+Folds 2000 random batches into a StreamingPosterior on a 10001-point
+grid, and times that against calling posterior(x_total, n_total) after
+every batch and against the grid-free Beta updater.
+"""
+
+
+import time
+
+import numpy as np
+
+posterior = __import__('3-posterior').posterior
+StreamingPosterior = __import__('stream_update').StreamingPosterior
+
+
+def main():
+    """Times the three ways and checks the final posteriors agree"""
+    rng = np.random.default_rng(0)
+    P = np.linspace(0, 1, 10001)
+    Pr = np.full(10001, 1 / 10001)
+    ns = [int(n) for n in rng.integers(1, 500, 2000)]
+    xs = [int(rng.binomial(n, 0.2)) for n in ns]
+
+    start = time.perf_counter()
+    x_total = n_total = 0
+    for x, n in zip(xs, ns):
+        x_total += x
+        n_total += n
+        ref = posterior(x_total, n_total, P, Pr)
+    t_recompute = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid = StreamingPosterior(P, Pr)
+    for x, n in zip(xs, ns):
+        grid.update(x, n)
+    t_grid = time.perf_counter() - start
+
+    start = time.perf_counter()
+    beta = StreamingPosterior()
+    for x, n in zip(xs, ns):
+        beta.update(x, n)
+    t_beta = time.perf_counter() - start
+
+    assert np.allclose(grid.posterior(), ref)
+    print("{:>12} {:>12} {:>12}".format("recompute s", "stream s", "beta s"))
+    print("{:12.4f} {:12.4f} {:12.4f}".format(t_recompute, t_grid, t_beta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cost of the fused posterior update against separate calls
+
+For k observations on a 1001-point grid, compares intersection() and
+marginal() called per observation (each validating and computing the
+likelihood on its own), posterior() per observation, and one batched
+update() over all k.
+"""
+
+
+import time
+
+import numpy as np
+
+intersection = __import__('1-intersection').intersection
+marginal = __import__('2-marginal').marginal
+posterior = __import__('3-posterior').posterior
+update = __import__('3-posterior').update
+
+
+def separate(xs, ns, P, Pr):
+    """Posteriors from an intersection and a marginal call each"""
+    return np.array([intersection(x, n, P, Pr) / marginal(x, n, P, Pr)
+                     for x, n in zip(xs, ns)])
+
+
+def looped(xs, ns, P, Pr):
+    """Posteriors from one posterior call each"""
+    return np.array([posterior(x, n, P, Pr) for x, n in zip(xs, ns)])
+
+
+def batched(xs, ns, P, Pr):
+    """Posteriors from one batched update"""
+    return update(np.array(xs), np.array(ns), P, Pr)[3]
+
+
+def main():
+    """Times the three ways over growing batches"""
+    rng = np.random.default_rng(0)
+    P = np.linspace(0, 1, 1001)
+    Pr = np.full(1001, 1 / 1001)
+    print("{:>6} {:>12} {:>12} {:>12}".format(
+        "k", "separate s", "posterior s", "batched s"))
+    for k in (10, 100, 1000):
+        ns = [int(n) for n in rng.integers(1, 10000, k)]
+        xs = [int(rng.integers(0, n + 1)) for n in ns]
+        times = []
+        results = []
+        for fn in (separate, looped, batched):
+            start = time.perf_counter()
+            results.append(fn(xs, ns, P, Pr))
+            times.append(time.perf_counter() - start)
+        assert np.allclose(results[0], results[2])
+        assert np.allclose(results[1], results[2])
+        print("{:6d} {:12.4f} {:12.4f} {:12.4f}".format(k, *times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Log-space binomial likelihood kernels and their input checks"""
+from math import lgamma
+
+import numpy as np
+
+_lgamma = np.frompyfunc(lgamma, 1, 1)
+
+
+def validate(x, n, P, Pr=None):
+    """
+    Checks the data and the prior grid, in the order (and with the
+    messages) of likelihood and intersection; Pr is skipped when None
+
+    x and n are ints, or for a batch of observations 1D integer arrays
+    (or one of them an int) broadcast to a common length k.
+    Returns:
+        x, n: as given for ints, else int64 arrays of shape (k, 1) that
+            broadcast against P
+    """
+    x, n = validate_data(x, n)
+    validate_grid(P, Pr)
+    return x, n
+
+
+def validate_data(x, n):
+    """The x and n checks of validate, returning x, n as validate does"""
+    batched = np.ndim(x) > 0 or np.ndim(n) > 0
+    if batched:
+        try:
+            x, n = np.broadcast_arrays(np.asarray(x), np.asarray(n))
+        except ValueError:
+            raise ValueError("x and n must have the same length")
+        if n.ndim != 1 or n.dtype.kind not in 'iu' or np.any(n <= 0):
+            raise ValueError("n must be a positive integer")
+        if x.dtype.kind not in 'iu' or np.any(x < 0):
+            raise ValueError(
+                "x must be an integer that is greater than or equal to 0"
+            )
+    else:
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive integer")
+        if not isinstance(x, int) or x < 0:
+            raise ValueError(
+                "x must be an integer that is greater than or equal to 0"
+            )
+    if np.any(x > n):
+        raise ValueError("x cannot be greater than n")
+    if batched:
+        return (x.astype(np.int64)[:, None], n.astype(np.int64)[:, None])
+    return x, n
+
+
+def validate_grid(P, Pr=None):
+    """The P and Pr checks of validate"""
+    if not isinstance(P, np.ndarray) or P.ndim != 1:
+        raise TypeError("P must be a 1D numpy.ndarray")
+    if Pr is not None and (not isinstance(Pr, np.ndarray) or
+                           Pr.shape != P.shape):
+        raise TypeError("Pr must be a numpy.ndarray with the same shape as P")
+    if np.any(P < 0) or np.any(P > 1):
+        raise ValueError("All values in P must be in the range [0, 1]")
+    if Pr is not None:
+        if np.any(Pr < 0) or np.any(Pr > 1):
+            raise ValueError("All values in Pr must be in the range [0, 1]")
+        if not np.isclose(np.sum(Pr), 1):
+            raise ValueError("Pr must sum to 1")
+
+
+def log_binom(n, x):
+    """log C(n, x) from lgamma, O(1) per observation for any n"""
+    if np.ndim(n) == 0 and np.ndim(x) == 0:
+        return lgamma(n + 1) - lgamma(x + 1) - lgamma(n - x + 1)
+    n, x = np.asarray(n, np.float64), np.asarray(x, np.float64)
+    return (_lgamma(n + 1) - _lgamma(x + 1) -
+            _lgamma(n - x + 1)).astype(np.float64)
+
+
+def xlogy(k, p):
+    """k * log(p), 0 where k == 0 (so 0 * log(0) is 0, not nan)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(k == 0, 0.0, k * np.log(p))
+
+
+def xlog1py(k, p):
+    """k * log(1 + p), 0 where k == 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(k == 0, 0.0, k * np.log1p(p))
+
+
+def log_likelihood(x, n, P):
+    """
+    log P(x | n, p) for each p in P, -inf where the likelihood is 0
+
+    C(n, x) comes from lgamma and P^x * (1 - P)^(n - x) from xlogy and
+    xlog1py, so the cost is O(len(P)) for any n and nothing overflows
+    or underflows before the final exp. x and n may be (k, 1) arrays
+    (see validate), giving one row per observation.
+    """
+    return log_binom(n, x) + xlogy(x, P) + xlog1py(n - x, -P)
+
+
+def log_prior(Pr):
+    """log(Pr), -inf where Pr is 0"""
+    with np.errstate(divide='ignore'):
+        return np.log(np.asarray(Pr, dtype=np.float64))
+
+
+def logsumexp(a, axis=None):
+    """log(sum(exp(a))) over axis without overflow or underflow"""
+    top = np.max(a, axis=axis, keepdims=True)
+    top = np.where(np.isfinite(top), top, 0)
+    with np.errstate(divide='ignore'):
+        out = top + np.log(np.sum(np.exp(a - top), axis=axis, keepdims=True))
+    return np.squeeze(out, axis=axis)[()]
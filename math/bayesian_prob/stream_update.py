@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Sequential Bayesian update over a stream of (x, n) batches"""
+import numpy as np
+
+kernels = __import__('log_kernels')
+
+
+class StreamingPosterior:
+    """
+    Posterior of the side-effect probability, updated one batch of
+    patients at a time
+
+    Keeps the log-posterior over a grid P and, always, the conjugate
+    Beta(alpha, beta) posterior (the closed form 100-continuous.py
+    uses, from a Beta(1, 1) prior by default). Folding in a batch
+    costs O(len(P)) on the grid and O(1) for the Beta, whatever the
+    totals so far; without a grid only the Beta is kept.
+    Attributes:
+        P (numpy.ndarray or None): the grid of hypothetical probabilities
+        log_post (numpy.ndarray or None): log-posterior over P
+        alpha, beta (float): parameters of the Beta posterior
+        x, n (int): totals of the batches folded in so far
+        log_marginal (float): log probability of the batches, each
+            given the ones before it (on the grid, 0. without one)
+    """
+
+    def __init__(self, P=None, Pr=None, alpha=1., beta=1.):
+        """
+        Args:
+            P (numpy.ndarray, optional): 1D grid of probabilities
+            Pr (numpy.ndarray, optional): prior beliefs about P,
+                uniform when None
+            alpha, beta (float, optional): Beta prior parameters
+        Raises:
+            TypeError, ValueError: as for 3-posterior.posterior on P, Pr
+            ValueError: If alpha or beta is not positive
+        """
+        if alpha <= 0 or beta <= 0:
+            raise ValueError("alpha and beta must be positive")
+        self.alpha = float(alpha)
+        self.beta = float(beta)
+        self.x = 0
+        self.n = 0
+        self.log_marginal = 0.
+        self.P = None
+        self.log_post = None
+        if P is not None:
+            kernels.validate_grid(P, Pr)
+            if Pr is None:
+                Pr = np.full(P.shape, 1 / P.size)
+            self.P = P.astype(np.float64)
+            log_prior = kernels.log_prior(Pr)
+            self.log_post = log_prior - kernels.logsumexp(log_prior)
+
+    def update(self, x, n):
+        """
+        Folds in a batch of x side effects among n patients
+        Args:
+            x (int or 1D array of ints): patients in the batch with
+                severe side effects, or one count per group of a batch
+            n (int or 1D array of ints): patients in the batch, or one
+                count per group
+        Returns:
+            self, so updates can be chained
+        Raises:
+            ValueError: as for 3-posterior.posterior on x, n
+        """
+        x, n = kernels.validate_data(x, n)
+        # The grid and Beta updates only need the totals of a batch;
+        # each group's C(n, x) still enters the marginal
+        log_coef = float(np.sum(kernels.log_binom(n, x)))
+        x, n = int(np.sum(x)), int(np.sum(n))
+        self.x += x
+        self.n += n
+        self.alpha += x
+        self.beta += n - x
+        if self.log_post is not None:
+            # C(n, x) is the same for every p, so it only enters the
+            # marginal; the posterior is renormalised in log space
+            log_int = self.log_post + (kernels.xlogy(x, self.P) +
+                                       kernels.xlog1py(n - x, -self.P))
+            log_marg = kernels.logsumexp(log_int)
+            self.log_post = log_int - log_marg
+            self.log_marginal += log_coef + log_marg
+        return self
+
+    def posterior(self):
+        """
+        Returns:
+            numpy.ndarray: posterior probability of each value in P,
+            equal to 3-posterior.posterior(x, n, P, Pr) on the totals
+        Raises:
+            ValueError: If there is no grid
+        """
+        if self.log_post is None:
+            raise ValueError("posterior needs a grid P")
+        return np.exp(self.log_post)
+
+    def interval(self, p1, p2):
+        """
+        Posterior probability that p is within [p1, p2] under the Beta
+        posterior, in O(1); the same value as 100-continuous.posterior
+        on the totals when the prior is Beta(1, 1)
+        Args:
+            p1 (float): lower bound on the range
+            p2 (float): upper bound on the range
+        Returns:
+            float: the posterior probability of the range
+        """
+        if not isinstance(p1, float) or p1 < 0 or p1 > 1:
+            raise ValueError("p1 must be a float in the range [0, 1]")
+        if not isinstance(p2, float) or p2 < 0 or p2 > 1:
+            raise ValueError("p2 must be a float in the range [0, 1]")
+        if p2 <= p1:
+            raise ValueError("p2 must be greater than p1")
+        # Only the Beta path needs scipy
+        from scipy import special
+        return (special.betainc(self.alpha, self.beta, p2) -
+                special.betainc(self.alpha, self.beta, p1))
+
+    def checkpoint(self):
+        """
+        Returns:
+            dict: a copy of the state, e.g. for numpy.savez(**state);
+            restore rebuilds the updater from it
+        """
+        state = {'alpha': self.alpha, 'beta': self.beta, 'x': self.x,
+                 'n': self.n, 'log_marginal': self.log_marginal}
+        if self.log_post is not None:
+            state['P'] = self.P.copy()
+            state['log_post'] = self.log_post.copy()
+        return state
+
+    @classmethod
+    def restore(cls, state):
+        """
+        Rebuilds an updater from a checkpoint
+        Args:
+            state (dict or numpy NpzFile): as returned by checkpoint
+        Returns:
+            StreamingPosterior: continuing from the checkpointed state
+        """
+        updater = cls(alpha=float(state['alpha']), beta=float(state['beta']))
+        updater.x = int(state['x'])
+        updater.n = int(state['n'])
+        updater.log_marginal = float(state['log_marginal'])
+        if 'log_post' in state:
+            updater.P = np.array(state['P'], dtype=np.float64)
+            updater.log_post = np.array(state['log_post'], dtype=np.float64)
+        return updater
@@ -2,8 +2,10 @@
 """Performs a valid convolution on grayscale images."""
 import numpy as np
 
+engine = __import__('conv_engine')
 
-def convolve_grayscale_valid(images, kernel):
+
+def convolve_grayscale_valid(images, kernel, separable=None):
     """
     Performs a valid convolution on grayscale images.
     Args:
@@ -11,11 +13,17 @@ def convolve_grayscale_valid(images, kernel):
             multiple grayscale images
         kernel: numpy.ndarray with shape (kh, kw) containing
             the convolution kernel
+        separable: (col, row) factors of kernel = outer(col, row), None
+            to detect a rank-1 kernel by SVD, or False to always use
+            the full kernel; separable kernels run as two 1-D passes
     Returns:
         numpy.ndarray containing the convolved images
     """
     m, h, w = images.shape
     kh, kw = kernel.shape
+    factors = engine.kernel_factors(kernel, separable)
+    if factors is not None:
+        return engine.separable_conv2d(images, *factors)
     # Calculate output dimensions for valid convolution
     output_h = h - kh + 1
     output_w = w - kw + 1
@@ -2,8 +2,10 @@
 """Performs a valid convolution on grayscale images."""
 import numpy as np
 
+engine = __import__('conv_engine')
 
-def convolve_grayscale_same(images, kernel):
+
+def convolve_grayscale_same(images, kernel, separable=None):
     """
     Performs a same convolution on grayscale images.
     Args:
@@ -11,6 +13,9 @@ def convolve_grayscale_same(images, kernel):
           multiple grayscale images
         kernel: numpy.ndarray with shape (kh, kw) containing
           the convolution kernel
+        separable: (col, row) factors of kernel = outer(col, row), None
+          to detect a rank-1 kernel by SVD, or False to always use
+          the full kernel; separable kernels run as two 1-D passes
     Returns:
         numpy.ndarray containing the convolved images with
         same dimensions as input
@@ -31,6 +36,10 @@ def convolve_grayscale_same(images, kernel):
         mode='constant',
         constant_values=0
     )
+    factors = engine.kernel_factors(kernel, separable)
+    if factors is not None:
+        # Even kernels give one extra row/column; keep (h, w)
+        return engine.separable_conv2d(padded_images, *factors)[:, :h, :w]
     # Initialize output array with same dimensions as input
     convolved = np.zeros((m, h, w))
     # Perform convolution using only two for loops
@@ -4,44 +4,71 @@
 
 import numpy as np
 
+engine = __import__('conv_engine')
 
-def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
-    """Function to perform convolution with custom padding and stride"""
+
+def convolve_grayscale(images, kernel, padding='same', stride=(1, 1),
+                       method='auto', separable=None, dtype=None):
+    """
+    Function to perform convolution with custom padding and stride
+
+    Args:
+        images: numpy.ndarray with shape (m, h, w), or (m, h, w, 3) RGB
+            images that are converted to grayscale first
+        kernel: numpy.ndarray with shape (kh, kw)
+        padding: 'same', 'valid' or a tuple (ph, pw)
+        stride: tuple (sh, sw)
+        method: 'direct' (im2col/GEMM), 'fft' (overlap-add FFT, for
+            large kernels) or 'auto' to pick the cheaper one from the
+            kernel and image size (see conv_engine.choose_method)
+        separable: (col, row) factors of kernel = outer(col, row), None
+            to detect a rank-1 kernel by SVD, or False to always use
+            the full kernel; with method 'auto', given factors always
+            run as two 1-D passes and detected ones do when that is the
+            cheapest option
+        dtype: storage dtype of the result, e.g. float16; see
+            conv_engine.conv_dtypes for the compute dtype (float32
+            images and kernel stay float32, integer images with an
+            integer kernel accumulate in int16/int32 and always run
+            'direct')
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w)
+    """
 
     if images.ndim == 4:
-        m, h, w, _ = images.shape
-        # Convert RGB to grayscale
-        images = (0.2989 * images[:, :, :, 0] +
-                  0.5870 * images[:, :, :, 1] +
-                  0.1140 * images[:, :, :, 2])
-    else:
-        m, h, w = images.shape
+        # Convert RGB to grayscale, in float32 unless images are float64
+        gray = np.result_type(images.dtype, np.float32).type
+        images = (gray(0.2989) * images[:, :, :, 0] +
+                  gray(0.5870) * images[:, :, :, 1] +
+                  gray(0.1140) * images[:, :, :, 2])
 
+    m, h, w = images.shape
     kh, kw = kernel.shape
-    sh, sw = stride
-
-    if padding == 'same':
-        ph = ((h - 1) * sh + kh - h) // 2 + 1
-        pw = ((w - 1) * sw + kw - w) // 2 + 1
-    elif padding == 'valid':
-        ph, pw = 0, 0
+    pads = engine.pad_amounts(h, w, kh, kw, padding, stride)
+    compute, store = engine.conv_dtypes(images.dtype,
+                                        kernel[:, :, None, None], dtype)
+    if np.issubdtype(compute, np.integer):
+        method = 'direct'
+    factors = None
+    if method == 'auto':
+        factors = engine.kernel_factors(kernel, separable)
+    if factors is not None and separable is not None:
+        method = 'separable'
     else:
-        ph, pw = padding
-
-    # Dimensions of the output after padding and considering stride
-    new_h = (h + 2 * ph - kh) // sh + 1
-    new_w = (w + 2 * pw - kw) // sw + 1
-
-    # Pad the grayscale images
-    padded = np.pad(images, ((0, 0), (ph, ph), (pw, pw)), mode='constant')
+        method = engine.choose_method(h, w, kh, kw, 1, pads, stride,
+                                      method, factors is not None)
 
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w))
+    if method == 'separable':
+        padded = engine.pad_images(images[..., None], pads)[..., 0]
+        output = engine.separable_conv2d(padded, *factors, stride, compute)
+        return output.astype(store, copy=False)
 
-    # Convolve the images with kernel
-    for y in range(0, new_h * sh, sh):
-        for x in range(0, new_w * sw, sw):
-            output[:, y // sh, x // sw] = np.sum(
-                padded[:, y: y + kh, x: x + kw] * kernel, axis=(1, 2))
+    if method == 'direct':
+        return engine.conv2d(images[..., None], kernel[:, :, None, None],
+                             pads, stride, dtype=dtype)[..., 0]
 
-    return output
+    out_hw = engine.output_size(h, w, kh, kw, pads, stride)
+    padded = engine.pad_images(images[..., None], pads)
+    output = engine.fft_conv2d(padded, kernel[:, :, None], stride, out_hw,
+                               dtype=compute)
+    return output.astype(store, copy=False)
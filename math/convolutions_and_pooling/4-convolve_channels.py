@@ -4,42 +4,49 @@
 
 import numpy as np
 
-
-def convolve_channels(images, kernel, padding='same', stride=(1, 1)):
-    """Function to perform convolution with channels"""
+engine = __import__('conv_engine')
+
+
+def convolve_channels(images, kernel, padding='same', stride=(1, 1),
+                      method='auto', dtype=None):
+    """
+    Function to perform convolution with channels
+
+    Args:
+        images: numpy.ndarray with shape (m, h, w, c)
+        kernel: numpy.ndarray with shape (kh, kw, c)
+        padding: 'same', 'valid' or a tuple (ph, pw)
+        stride: tuple (sh, sw)
+        method: 'direct' (im2col/GEMM), 'fft' (overlap-add FFT, for
+            large kernels) or 'auto' to pick the cheaper one from the
+            kernel and image size (see conv_engine.choose_method)
+        dtype: storage dtype of the result, e.g. float16; see
+            conv_engine.conv_dtypes for the compute dtype (integer
+            images with an integer kernel always run 'direct')
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w)
+    """
 
     m, h, w, c = images.shape
     kh, kw, kc = kernel.shape
-    sh, sw = stride
 
     # Check if channels match
     if c != kc:
         raise ValueError(
             "Number of channels in the image and kernel should be the same")
 
-    if padding == 'same':
-        ph = ((h - 1) * sh + kh - h) // 2 + 1
-        pw = ((w - 1) * sw + kw - w) // 2 + 1
-    elif padding == 'valid':
-        ph, pw = 0, 0
-    else:
-        ph, pw = padding
-
-    # Gives dimensions of the output after padding and considering stride
-    new_h = (h + 2 * ph - kh) // sh + 1
-    new_w = (w + 2 * pw - kw) // sw + 1
-
-    # Pad the images
-    padded = np.pad(images, (
-        (0, 0), (ph, ph), (pw, pw), (0, 0)), mode='constant')
-
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w))
-
-    # Convolve the images with kernel
-    for y in range(0, new_h * sh, sh):
-        for x in range(0, new_w * sw, sw):
-            output[:, y // sh, x // sw] = np.sum(
-                padded[:, y: y + kh, x: x + kw, :] * kernel, axis=(1, 2, 3))
-
-    return output
+    pads = engine.pad_amounts(h, w, kh, kw, padding, stride)
+    compute, store = engine.conv_dtypes(images.dtype, kernel[..., None],
+                                        dtype)
+    if np.issubdtype(compute, np.integer):
+        method = 'direct'
+    method = engine.choose_method(h, w, kh, kw, c, pads, stride, method)
+
+    if method == 'direct':
+        return engine.conv2d(images, kernel[..., None], pads, stride,
+                             dtype=dtype)[..., 0]
+
+    out_hw = engine.output_size(h, w, kh, kw, pads, stride)
+    output = engine.fft_conv2d(engine.pad_images(images, pads), kernel,
+                               stride, out_hw, dtype=compute)
+    return output.astype(store, copy=False)
@@ -2,46 +2,41 @@
 """Multiple Kernel Convolution"""
 
 
-import numpy as np
-
-
-def convolve(images, kernels, padding='same', stride=(1, 1)):
-    """Function to perform convolution with multiple kernels"""
-
-    m, h, w, c = images.shape
-    kh, kw, kc, nc = kernels.shape
-    sh, sw = stride
-
-    # Check if channels in images match channels in kernel
-    if c != kc:
-        raise ValueError(
-            "Number of channels in the image and kernel should be the same")
-
-    if padding == 'same':
-        ph = ((h - 1) * sh + kh - h) // 2 + 1
-        pw = ((w - 1) * sw + kw - w) // 2 + 1
-    elif padding == 'valid':
-        ph, pw = 0, 0
-    else:
-        ph, pw = padding
-
-    # Gives dimensions of the output after padding and considering stride
-    new_h = (h + 2 * ph - kh) // sh + 1
-    new_w = (w + 2 * pw - kw) // sw + 1
-
-    # Pad the images
-    padded = np.pad(images,
-                    ((0, 0), (ph, ph), (pw, pw), (0, 0)), mode='constant')
-
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w, nc))
-
-    # Convolve the images with multiple kernels
-    for n in range(nc):
-        for y in range(0, new_h * sh, sh):
-            for x in range(0, new_w * sw, sw):
-                output[:, y // sh, x // sw, n] = np.sum(
-                    padded[:, y: y + kh, x: x + kw, :] * kernels[:, :, :, n],
-                    axis=(1, 2, 3))
-
-    return output
+engine = __import__('conv_engine')
+
+
+def convolve(images, kernels, padding='same', stride=(1, 1),
+             dilation=(1, 1), max_bytes=None, out=None, dtype=None):
+    """
+    Function to perform convolution with multiple kernels
+
+    All kernels are applied in one im2col/GEMM pass (see conv_engine)
+    instead of looping over kernels and output positions. Passing
+    max_bytes or out switches to tiled execution (see
+    conv_engine.conv2d_tiled): chunks of images and tiles of output
+    rows are padded on the fly and written straight into out, with the
+    per-step temporaries held under max_bytes.
+
+    Args:
+        images: numpy.ndarray with shape (m, h, w, c)
+        kernels: numpy.ndarray with shape (kh, kw, c, nc)
+        padding: 'same', 'valid' or a tuple (ph, pw)
+        stride: tuple (sh, sw)
+        dilation: tuple (dh, dw), spacing between kernel taps
+        max_bytes: peak-memory budget in bytes for tiled execution
+        out: numpy.ndarray or memory map to write the result into, or
+            a path for a new .npy memory map
+        dtype: storage dtype of the result, e.g. float16; see
+            conv_engine.conv_dtypes for the compute dtype (float32
+            stays float32, integer images with integer kernels
+            accumulate in int16/int32)
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w, nc)
+    """
+    if max_bytes is not None or out is not None:
+        if max_bytes is None:
+            return engine.conv2d_tiled(images, kernels, padding, stride,
+                                       dilation, out=out, dtype=dtype)
+        return engine.conv2d_tiled(images, kernels, padding, stride,
+                                   dilation, max_bytes, out, dtype)
+    return engine.conv2d(images, kernels, padding, stride, dilation, dtype)
@@ -4,31 +4,92 @@
 
 import numpy as np
 
+engine = __import__('conv_engine')
 
-def pool(images, kernel_shape, stride, mode='max'):
-    """Function to perform pooling on images"""
 
+def _window_reduce(x, kh, kw, stride, out_hw, ufunc, dtype=None):
+    """
+    Reduces every (kh, kw) window of x with ufunc (np.maximum/np.add)
+
+    Global windows reduce the whole plane, non-overlapping windows are
+    reshaped into their own axes, and anything else (overlapping or
+    gapped windows) is reduced separably: first along rows over kw,
+    then along columns over kh, which costs kh + kw instead of kh * kw
+    per output.
+    """
+    m, h, w, c = x.shape
+    sh, sw = stride
+    new_h, new_w = out_hw
+    x = x[:, :(new_h - 1) * sh + kh, :(new_w - 1) * sw + kw]
+    if new_h == 1 and new_w == 1:
+        return ufunc.reduce(x, axis=(1, 2), dtype=dtype, keepdims=True)
+    if (sh, sw) == (kh, kw):
+        blocks = x.reshape(m, new_h, kh, new_w, kw, c)
+        return ufunc.reduce(blocks, axis=(2, 4), dtype=dtype)
+    rows = engine.windows(x, 1, kw, (1, sw), out_hw=(x.shape[1], new_w))
+    rows = ufunc.reduce(rows, axis=(3, 4), dtype=dtype)
+    cols = engine.windows(rows, kh, 1, (sh, 1), out_hw=(new_h, new_w))
+    return ufunc.reduce(cols, axis=(3, 4))
+
+
+def _argmax(images, kh, kw, stride, out_hw):
+    """
+    Position of each window maximum as a flat index into its (h, w)
+    image plane, row * w + col
+    """
     m, h, w, c = images.shape
-    kh, kw = kernel_shape
     sh, sw = stride
+    new_h, new_w = out_hw
+    patches = engine.windows(images, kh, kw, stride, out_hw=out_hw)
+    local = patches.reshape(m, new_h, new_w, kh * kw, c).argmax(axis=3)
+    row = np.arange(new_h)[:, None, None] * sh + local // kw
+    col = np.arange(new_w)[None, :, None] * sw + local % kw
+    return row * w + col
+
+
+def pool(images, kernel_shape, stride, mode='max', p=2,
+         return_indices=False):
+    """
+    Function to perform pooling on images
+
+    The windows are reduced all at once on strided views of images
+    instead of one output position at a time. Max pooling keeps the
+    dtype of images (uint8 stays uint8); avg and lp pooling of integer
+    images accumulate in integers and return float32.
+
+    Args:
+        images: numpy.ndarray with shape (m, h, w, c)
+        kernel_shape: tuple (kh, kw)
+        stride: tuple (sh, sw)
+        mode: 'max', 'avg' or 'lp' (p-norm of each window)
+        p: order of the norm for 'lp'
+        return_indices: for 'max', also return the position of every
+            maximum (flat index row * w + col into its image plane), for
+            unpooling and backpropagation
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w, c), and the int
+        indices of the same shape when return_indices is True
+    """
+    if mode not in ('max', 'avg', 'lp'):
+        raise ValueError("Mode should be either 'max', 'avg' or 'lp'")
+    if return_indices and mode != 'max':
+        raise ValueError("return_indices is only defined for 'max' mode")
+
+    m, h, w, c = images.shape
+    kh, kw = kernel_shape
+    out_hw = engine.output_size(h, w, kh, kw, (0, 0), stride)
+    integer = np.issubdtype(images.dtype, np.integer)
+    real = np.float32 if integer else images.dtype
 
-    # Gives dimensions of the output after pooling and considering stride
-    new_h = (h - kh) // sh + 1
-    new_w = (w - kw) // sw + 1
-
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w, c))
-
-    # Pooling operation based on mode
-    for y in range(0, new_h * sh, sh):
-        for x in range(0, new_w * sw, sw):
-            if mode == 'max':
-                output[:, y // sh, x // sw, :] = np.max(
-                    images[:, y: y + kh, x: x + kw, :], axis=(1, 2))
-            elif mode == 'avg':
-                output[:, y // sh, x // sw, :] = np.mean(
-                    images[:, y: y + kh, x: x + kw, :], axis=(1, 2))
-            else:
-                raise ValueError("Mode should be either 'max' or 'avg'")
-
-    return output
+    if mode == 'max':
+        output = _window_reduce(images, kh, kw, stride, out_hw, np.maximum)
+        if return_indices:
+            return output, _argmax(images, kh, kw, stride, out_hw)
+        return output
+    if mode == 'avg':
+        acc = np.promote_types(images.dtype, np.int32) if integer else None
+        total = _window_reduce(images, kh, kw, stride, out_hw, np.add, acc)
+        return np.divide(total, kh * kw, dtype=real)
+    powered = np.power(np.abs(images), p, dtype=real)
+    total = _window_reduce(powered, kh, kw, stride, out_hw, np.add)
+    return np.power(total, 1 / p, dtype=real)
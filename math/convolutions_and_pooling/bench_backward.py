@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Gradient checks of conv_backward, then timed training steps
+
+The checks compare every analytic gradient with central differences
+of a random linear loss on small inputs. The training step is conv
+-> ReLU -> 2x2 max pool -> mean squared error on 64x64x64x8 images with
+16 3x3 kernels, followed by an SGD update.
+"""
+
+
+import time
+
+import numpy as np
+
+convolve = __import__('5-convolve').convolve
+pool = __import__('6-pool').pool
+backward = __import__('conv_backward')
+
+EPS = 1e-6
+
+
+def numeric(loss, x):
+    """Central-difference gradient of loss() with respect to x"""
+    grad = np.zeros_like(x)
+    for index in np.ndindex(x.shape):
+        old = x[index]
+        x[index] = old + EPS
+        up = loss()
+        x[index] = old - EPS
+        down = loss()
+        x[index] = old
+        grad[index] = (up - down) / (2 * EPS)
+    return grad
+
+
+def check():
+    """Asserts analytic == numeric gradients over padding and stride"""
+    rng = np.random.default_rng(1)
+    images = rng.standard_normal((2, 7, 6, 2))
+    kernels = rng.standard_normal((3, 2, 2, 3))
+    bias = rng.standard_normal((1, 1, 1, 3))
+    for padding, stride, dilation in (('same', (1, 1), (1, 1)),
+                                      ('valid', (2, 1), (1, 1)),
+                                      ((1, 2), (1, 2), (2, 1))):
+        Z = convolve(images, kernels, padding, stride, dilation)
+        weights = rng.standard_normal(Z.shape)
+
+        def loss():
+            """Random linear loss of the convolution"""
+            return np.sum(weights * (convolve(images, kernels, padding,
+                                              stride, dilation) + bias))
+
+        dX, dK, db = backward.conv_backward(weights, images, kernels,
+                                            padding, stride, dilation)
+        assert np.allclose(dX, numeric(loss, images), atol=1e-5)
+        assert np.allclose(dK, numeric(loss, kernels), atol=1e-5)
+        assert np.allclose(db, numeric(loss, bias), atol=1e-5)
+
+    for mode in ('max', 'avg'):
+        for shape, stride in (((2, 2), (2, 2)), ((3, 3), (1, 1)),
+                              ((2, 3), (3, 2))):
+            A = pool(images, shape, stride, mode)
+            weights = rng.standard_normal(A.shape)
+
+            def loss():
+                """Random linear loss of the pooling"""
+                return np.sum(weights * pool(images, shape, stride, mode))
+
+            dX = backward.pool_backward(weights, images, shape, stride,
+                                        mode)
+            assert np.allclose(dX, numeric(loss, images), atol=1e-5)
+    print("conv and pool gradients match central differences")
+
+
+def step(images, target, kernels, bias, rate=0.5):
+    """One forward/backward/SGD step; returns the loss and phase times"""
+    start = time.perf_counter()
+    Z = convolve(images, kernels) + bias
+    A = np.maximum(Z, 0)
+    P, indices = pool(A, (2, 2), (2, 2), 'max', return_indices=True)
+    loss = 0.5 * np.mean((P - target) ** 2)
+    middle = time.perf_counter()
+    dA = backward.pool_backward((P - target) / P.size, A, (2, 2), (2, 2),
+                                'max', indices)
+    dZ = dA * (Z > 0)
+    _, dK, db = backward.conv_backward(dZ, images, kernels)
+    kernels -= rate * dK
+    bias -= rate * db
+    end = time.perf_counter()
+    return loss, middle - start, end - middle
+
+
+def main():
+    """Runs the checks, then times a few training steps"""
+    check()
+    rng = np.random.default_rng(0)
+    images = rng.standard_normal((64, 64, 64, 8))
+    kernels = rng.standard_normal((3, 3, 8, 16)) * 0.1
+    bias = np.zeros((1, 1, 1, 16))
+    target = rng.standard_normal((64, 33, 33, 16))
+    print("{:>5} {:>12} {:>10} {:>10}".format(
+        "step", "loss", "forward", "backward"))
+    for i in range(3):
+        loss, t_fwd, t_bwd = step(images, target, kernels, bias)
+        print("{:>5} {:12.6f} {:10.3f} {:10.3f}".format(
+            i, loss, t_fwd, t_bwd))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark of the GEMM convolve against the original loop version"""
+
+
+import sys
+import time
+
+import numpy as np
+
+convolve = __import__('5-convolve').convolve
+
+# (m, h, w, c, kh, kw, nc); the last case is the 224x224x64 layer
+CASES = [(8, 32, 32, 3, 3, 3, 16),
+         (4, 64, 64, 16, 3, 3, 32),
+         (1, 112, 112, 32, 5, 5, 64),
+         (1, 224, 224, 64, 3, 3, 128)]
+LOOP_MAX_WORK = 2e9
+
+
+def convolve_loop(images, kernels, padding='same', stride=(1, 1)):
+    """The original three-loop convolve, kept as a reference"""
+    m, h, w, c = images.shape
+    kh, kw, kc, nc = kernels.shape
+    sh, sw = stride
+    if padding == 'same':
+        ph = ((h - 1) * sh + kh - h) // 2 + 1
+        pw = ((w - 1) * sw + kw - w) // 2 + 1
+    elif padding == 'valid':
+        ph, pw = 0, 0
+    else:
+        ph, pw = padding
+    new_h = (h + 2 * ph - kh) // sh + 1
+    new_w = (w + 2 * pw - kw) // sw + 1
+    padded = np.pad(images,
+                    ((0, 0), (ph, ph), (pw, pw), (0, 0)), mode='constant')
+    output = np.zeros((m, new_h, new_w, nc))
+    for n in range(nc):
+        for y in range(0, new_h * sh, sh):
+            for x in range(0, new_w * sw, sw):
+                output[:, y // sh, x // sw, n] = np.sum(
+                    padded[:, y: y + kh, x: x + kw, :] * kernels[:, :, :, n],
+                    axis=(1, 2, 3))
+    return output
+
+
+def timed(fn, *args):
+    """Wall time in seconds and result of one call"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Prints loop and GEMM timings per case (--all runs every loop)"""
+    run_all = "--all" in sys.argv
+    rng = np.random.default_rng(0)
+    print("{:>28} {:>10} {:>10} {:>8}".format(
+        "m,h,w,c,kh,kw,nc", "loop", "gemm", "speedup"))
+    for m, h, w, c, kh, kw, nc in CASES:
+        images = rng.standard_normal((m, h, w, c))
+        kernels = rng.standard_normal((kh, kw, c, nc))
+        t_gemm, fast = timed(convolve, images, kernels)
+        work = m * h * w * c * kh * kw * nc
+        label = ",".join(str(v) for v in (m, h, w, c, kh, kw, nc))
+        if run_all or work <= LOOP_MAX_WORK:
+            t_loop, ref = timed(convolve_loop, images, kernels)
+            assert np.allclose(ref, fast)
+            print("{:>28} {:10.3f} {:10.3f} {:7.1f}x".format(
+                label, t_loop, t_gemm, t_loop / t_gemm))
+        else:
+            print("{:>28} {:>10} {:10.3f} {:>8}".format(
+                label, "skipped", t_gemm, "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Accuracy and throughput of the convolutions per dtype
+
+For each pipeline the float64 run is the reference; the other rows give
+their time, output size and largest error relative to max |reference|.
+The uint8 rows use integer kernels and must be exact.
+"""
+
+
+import time
+
+import numpy as np
+
+convolve = __import__('5-convolve').convolve
+convolve_grayscale = __import__('3-convolve_grayscale').convolve_grayscale
+
+
+def timed(fn, *args, **kwargs):
+    """Best wall time in seconds of three calls, and the result"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, runs):
+    """Prints one line per (label, fn, args, kwargs) against runs[0]"""
+    print(name)
+    print("{:>22} {:>8} {:>10} {:>10} {:>10}".format(
+        "dtype", "out", "time", "MB", "rel err"))
+    base, ref = None, None
+    for label, fn, args, kwargs in runs:
+        t, out = timed(fn, *args, **kwargs)
+        if ref is None:
+            base, ref = t, out.astype(np.float64)
+        err = np.abs(out.astype(np.float64) - ref).max() / np.abs(ref).max()
+        print("{:>22} {:>8} {:10.3f} {:10.1f} {:10.2e}   {:.2f}x".format(
+            label, out.dtype.name, t, out.nbytes / 2 ** 20, err, base / t))
+
+
+def main():
+    """Runs the multi-kernel and the RGB grayscale pipelines"""
+    rng = np.random.default_rng(0)
+
+    images = rng.standard_normal((32, 128, 128, 16))
+    kernels = rng.standard_normal((3, 3, 16, 32))
+    f32 = images.astype(np.float32), kernels.astype(np.float32)
+    report("convolve 32x128x128x16 * 3x3x16x32", [
+        ("float64", convolve, (images, kernels), {}),
+        ("float32", convolve, f32, {}),
+        ("float32 -> float16", convolve, f32, {'dtype': np.float16})])
+
+    pixels = rng.integers(0, 256, (32, 128, 128, 16), dtype=np.uint8)
+    taps = rng.integers(-4, 5, (3, 3, 16, 32))
+    report("convolve uint8 images, integer kernels", [
+        ("float64", convolve, (pixels.astype(np.float64),
+                               taps.astype(np.float64)), {}),
+        ("uint8 (int accumulate)", convolve, (pixels, taps), {})])
+
+    rgb = rng.integers(0, 256, (64, 256, 256, 3), dtype=np.uint8)
+    g = np.exp(-np.arange(-2, 3) ** 2 / 2.0)
+    kernel = np.outer(g, g) / g.sum() ** 2
+    report("convolve_grayscale uint8 RGB 64x256x256, 5x5 Gaussian", [
+        ("float64", convolve_grayscale, (rgb.astype(np.float64), kernel),
+         {}),
+        ("float32", convolve_grayscale, (rgb, kernel.astype(np.float32)),
+         {}),
+        ("float32 -> float16", convolve_grayscale,
+         (rgb, kernel.astype(np.float32)), {'dtype': np.float16})])
+
+
+if __name__ == "__main__":
+    main()
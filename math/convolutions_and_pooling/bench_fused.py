@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Equivalence and cost of fused_conv_pool.conv_pool against the
+three-step convolve -> bias + activation -> pool pipeline
+
+Checks every activation/pool mode combination on small inputs, then
+times both on a 64x128x128x16 batch with 32 3x3 kernels and reports
+their peak traced memory.
+"""
+
+
+import time
+import tracemalloc
+
+import numpy as np
+
+convolve = __import__('5-convolve').convolve
+pool = __import__('6-pool').pool
+fused = __import__('fused_conv_pool')
+
+
+def three_step(images, kernels, bias, activation, pool_shape, pool_stride,
+               pool_mode, padding='same', stride=(1, 1)):
+    """The unfused pipeline"""
+    z = convolve(images, kernels, padding, stride) + bias
+    if activation == 'relu':
+        z = np.maximum(z, 0)
+    elif activation == 'sigmoid':
+        z = 1 / (1 + np.exp(-z))
+    return pool(z, pool_shape, pool_stride, pool_mode)
+
+
+def measured(fn, *args, **kwargs):
+    """Wall time, peak traced memory in MB and result of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def check():
+    """Asserts fused == three-step over modes, paddings and strides"""
+    rng = np.random.default_rng(1)
+    images = rng.standard_normal((5, 23, 19, 3))
+    kernels = rng.standard_normal((3, 3, 3, 4))
+    bias = rng.standard_normal((1, 1, 1, 4))
+    for activation in ('relu', 'sigmoid', None):
+        for pool_mode in ('max', 'avg'):
+            for padding, stride in (('same', (1, 1)), ('valid', (2, 1)),
+                                    ((1, 2), (1, 2))):
+                for pool_shape, pool_stride in (((2, 2), None),
+                                                ((3, 3), (2, 2))):
+                    ref = three_step(images, kernels, bias, activation,
+                                     pool_shape, pool_stride or pool_shape,
+                                     pool_mode, padding, stride)
+                    for max_bytes in (2 ** 30, 20000):
+                        out = fused.conv_pool(
+                            images, kernels, bias, activation, pool_shape,
+                            pool_stride, pool_mode, padding, stride,
+                            max_bytes)
+                        assert np.allclose(out, ref)
+    print("fused output matches the three-step pipeline")
+
+
+def main():
+    """Checks equivalence, then times both pipelines"""
+    check()
+    rng = np.random.default_rng(0)
+    images = rng.standard_normal((64, 128, 128, 16))
+    kernels = rng.standard_normal((3, 3, 16, 32))
+    bias = rng.standard_normal((1, 1, 1, 32))
+    print("{:>8} {:>8} {:>10} {:>10} {:>10} {:>10}".format(
+        "act", "pool", "3-step s", "fused s", "3-step MB", "fused MB"))
+    for activation, pool_mode in (('relu', 'max'), ('sigmoid', 'avg')):
+        t3, m3, ref = measured(three_step, images, kernels, bias,
+                               activation, (2, 2), (2, 2), pool_mode)
+        tf, mf, out = measured(fused.conv_pool, images, kernels, bias,
+                               activation, (2, 2), None, pool_mode)
+        assert np.allclose(out, ref)
+        print("{:>8} {:>8} {:10.3f} {:10.3f} {:10.1f} {:10.1f}".format(
+            activation, pool_mode, t3, tf, m3, mf))
+
+
+if __name__ == "__main__":
+    main()
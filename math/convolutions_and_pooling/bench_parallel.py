@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Speedup of parallel_exec per worker count
+
+Run with OMP_NUM_THREADS=1 so BLAS does not add threads of its own.
+Pass --process to time the shared-memory process pool instead of
+threads.
+"""
+
+
+import sys
+import time
+
+import numpy as np
+
+px = __import__('parallel_exec')
+
+WORKERS = [1, 2, 4, 8, 16]
+# (name, function, args), all on 64 images of 64x64x16
+CASES = [('convolve', px.convolve, ((3, 3, 16, 32),)),
+         ('convolve_channels', px.convolve_channels, ((5, 5, 16),)),
+         ('pool', px.pool, ((2, 2), (2, 2)))]
+
+
+def timed(fn, *args, **kwargs):
+    """Best wall time in seconds of three calls"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Prints the time and speedup over one worker per case"""
+    backend = 'process' if '--process' in sys.argv else 'thread'
+    rng = np.random.default_rng(0)
+    images = rng.standard_normal((64, 64, 64, 16))
+    print("backend: {}".format(backend))
+    print("{:>18} {:>8} {:>10} {:>8}".format(
+        "function", "workers", "time", "speedup"))
+    for name, fn, args in CASES:
+        args = tuple(rng.standard_normal(a) if name != 'pool' else a
+                     for a in args)
+        base = None
+        for workers in WORKERS:
+            t = timed(fn, images, *args, workers=workers, backend=backend)
+            base = base or t
+            print("{:>18} {:>8} {:10.3f} {:7.2f}x".format(
+                name, workers, t, base / t))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the separable path of convolve_grayscale across kernel sizes
+
+Times Gaussian kernels on 64 images of 256x256 with the separable path
+off (the full kernel with method 'direct' and 'fft') and forced on
+(explicit factors), and reports what method 'auto' ends up costing.
+Direct im2col is skipped above DIRECT_MAX (its patch matrix does not
+fit in memory).
+"""
+
+
+import time
+
+import numpy as np
+
+convolve_grayscale = __import__('3-convolve_grayscale').convolve_grayscale
+
+SIZES = [3, 5, 7, 11, 15, 21, 31]
+DIRECT_MAX = 11
+
+
+def gaussian(k):
+    """1-D Gaussian of k taps with sigma k / 6, normalized"""
+    x = np.arange(k) - (k - 1) / 2
+    g = np.exp(-x ** 2 / (2 * (k / 6) ** 2))
+    return g / g.sum()
+
+
+def timed(fn, *args, **kwargs):
+    """Wall time in seconds and result of one call"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Prints one line per kernel size"""
+    rng = np.random.default_rng(0)
+    images = rng.standard_normal((64, 256, 256))
+    print("{:>5} {:>10} {:>10} {:>10} {:>10}".format(
+        "k", "direct", "fft", "separable", "auto"))
+    for k in SIZES:
+        g = gaussian(k)
+        kernel = np.outer(g, g)
+        t_fft, ref = timed(convolve_grayscale, images, kernel, method='fft',
+                           separable=False)
+        if k <= DIRECT_MAX:
+            t_direct, _ = timed(convolve_grayscale, images, kernel,
+                                method='direct', separable=False)
+            t_direct = "{:10.3f}".format(t_direct)
+        else:
+            t_direct = "{:>10}".format("skipped")
+        t_sep, fast = timed(convolve_grayscale, images, kernel,
+                            separable=(g, g))
+        t_auto, _ = timed(convolve_grayscale, images, kernel)
+        assert np.allclose(ref, fast)
+        print("{:>5} {} {:10.3f} {:10.3f} {:10.3f}".format(
+            k, t_direct, t_fft, t_sep, t_auto))
+
+
+if __name__ == "__main__":
+    main()
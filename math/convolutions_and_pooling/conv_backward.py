@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Backward pass of convolve and pool"""
+
+
+import numpy as np
+
+engine = __import__('conv_engine')
+pool = __import__('6-pool').pool
+
+
+def conv_backward(dZ, images, kernels, padding='same', stride=(1, 1),
+                  dilation=(1, 1)):
+    """
+    Gradients of Z = convolve(images, kernels, padding, stride,
+    dilation) + b
+
+    Both gradients go one kernel tap at a time over a strided slice
+    of the padded input: dK[i, j] contracts the slice with dZ in a
+    (c, nc) GEMM of the whole batch, and dX adds dZ times kernels[i, j]
+    back into it, so no im2col matrix is built for either.
+
+    Args:
+        dZ: numpy.ndarray with shape (m, new_h, new_w, nc), gradient
+            of the loss with respect to the convolution output
+        images: numpy.ndarray with shape (m, h, w, c), forward input
+        kernels: numpy.ndarray with shape (kh, kw, c, nc)
+        padding, stride, dilation: as for convolve
+    Returns:
+        dX with the shape of images, dK with the shape of kernels and
+        db with shape (1, 1, 1, nc)
+    """
+    m, h, w, c = images.shape
+    kh, kw, _, nc = kernels.shape
+    sh, sw = stride
+    dh, dw = dilation
+    pads = engine.pad_amounts(h, w, kh, kw, padding, stride, dilation)
+    ph, pw = pads
+    new_h, new_w = dZ.shape[1:3]
+    real = np.result_type(dZ, kernels, images, np.float32)
+
+    db = dZ.sum(axis=(0, 1, 2)).reshape(1, 1, 1, nc)
+    padded = engine.pad_images(images, pads)
+    dK = np.empty(kernels.shape, dtype=real)
+    dpadded = np.zeros((m, h + 2 * ph, w + 2 * pw, c), dtype=real)
+    span_h, span_w = (new_h - 1) * sh + 1, (new_w - 1) * sw + 1
+    for i in range(kh):
+        for j in range(kw):
+            tap = (slice(None), slice(i * dh, i * dh + span_h, sh),
+                   slice(j * dw, j * dw + span_w, sw))
+            dK[i, j] = np.tensordot(padded[tap], dZ,
+                                    axes=([0, 1, 2], [0, 1, 2]))
+            dpadded[tap] += np.tensordot(dZ, kernels[i, j],
+                                         axes=([3], [1]))
+    dX = dpadded[:, ph:ph + h, pw:pw + w]
+    return dX, dK, db
+
+
+def pool_backward(dA, images, kernel_shape, stride, mode='max',
+                  indices=None):
+    """
+    Gradient of pool(images, kernel_shape, stride, mode) with respect
+    to images
+
+    Max pooling routes each gradient to the position of its window
+    maximum, taken from indices (the second result of pool with
+    return_indices=True) or recomputed when None; positions shared by
+    overlapping windows add up. Avg pooling spreads each gradient
+    evenly over its window, one kernel tap at a time.
+
+    Args:
+        dA: numpy.ndarray with shape (m, new_h, new_w, c), gradient of
+            the loss with respect to the pooled output
+        images: numpy.ndarray with shape (m, h, w, c), forward input
+        kernel_shape: tuple (kh, kw)
+        stride: tuple (sh, sw)
+        mode: 'max' or 'avg'
+        indices: stored argmax indices for 'max'
+    Returns:
+        dX with the shape of images
+    """
+    m, h, w, c = images.shape
+    kh, kw = kernel_shape
+    sh, sw = stride
+    new_h, new_w = dA.shape[1:3]
+    real = np.result_type(dA, np.float32)
+
+    if mode == 'max':
+        if indices is None:
+            indices = pool(images, kernel_shape, stride, 'max',
+                           return_indices=True)[1]
+        # One flat bin per (image, channel, position)
+        base = (np.arange(m)[:, None, None, None] * c +
+                np.arange(c)) * (h * w)
+        dX = np.bincount((base + indices).ravel(), weights=dA.ravel(),
+                         minlength=m * c * h * w)
+        dX = dX.reshape(m, c, h, w).transpose(0, 2, 3, 1)
+        return dX.astype(real, copy=False)
+    if mode != 'avg':
+        raise ValueError("Mode should be either 'max' or 'avg'")
+
+    dX = np.zeros((m, h, w, c), dtype=real)
+    share = dA / (kh * kw)
+    span_h, span_w = (new_h - 1) * sh + 1, (new_w - 1) * sw + 1
+    for i in range(kh):
+        for j in range(kw):
+            dX[:, i:i + span_h:sh, j:j + span_w:sw] += share
+    return dX
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""Vectorized im2col/GEMM convolution engine"""
+
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+# Share of a plan_tiles budget kept for array headers and views
+_OVERHEAD_BYTES = 4096
+
+
+def pad_amounts(h, w, kh, kw, padding, stride, dilation=(1, 1)):
+    """
+    Padding (ph, pw) for a padding mode
+
+    Uses the same 'same' formula as the convolve functions, applied to
+    the dilated kernel extent.
+    """
+    sh, sw = stride
+    kh = (kh - 1) * dilation[0] + 1
+    kw = (kw - 1) * dilation[1] + 1
+    if padding == 'same':
+        ph = ((h - 1) * sh + kh - h) // 2 + 1
+        pw = ((w - 1) * sw + kw - w) // 2 + 1
+    elif padding == 'valid':
+        ph, pw = 0, 0
+    else:
+        ph, pw = padding
+    return ph, pw
+
+
+def output_size(h, w, kh, kw, pads, stride, dilation=(1, 1)):
+    """Output (new_h, new_w) of a convolution or pooling"""
+    ph, pw = pads
+    sh, sw = stride
+    kh = (kh - 1) * dilation[0] + 1
+    kw = (kw - 1) * dilation[1] + 1
+    return (h + 2 * ph - kh) // sh + 1, (w + 2 * pw - kw) // sw + 1
+
+
+def windows(padded, kh, kw, stride, dilation=(1, 1), out_hw=None):
+    """
+    Zero-copy patch view of padded images
+
+    Args:
+        padded: numpy.ndarray with shape (m, h, w, c)
+        kh, kw: kernel height and width
+        stride: (sh, sw)
+        dilation: (dh, dw) spacing between kernel taps
+        out_hw: (new_h, new_w), computed when None
+
+    Returns:
+        read-only view with shape (m, new_h, new_w, kh, kw, c) sharing
+        memory with padded
+    """
+    m, h, w, c = padded.shape
+    sh, sw = stride
+    dh, dw = dilation
+    if out_hw is None:
+        out_hw = output_size(h, w, kh, kw, (0, 0), stride, dilation)
+    s_m, s_h, s_w, s_c = padded.strides
+    return as_strided(padded,
+                      shape=(m, out_hw[0], out_hw[1], kh, kw, c),
+                      strides=(s_m, s_h * sh, s_w * sw,
+                               s_h * dh, s_w * dw, s_c),
+                      writeable=False)
+
+
+def pad_images(images, pads):
+    """Zero-pads (m, h, w, c) images on the two spatial axes"""
+    ph, pw = pads
+    if ph == 0 and pw == 0:
+        return images
+    return np.pad(images, ((0, 0), (ph, ph), (pw, pw), (0, 0)),
+                  mode='constant')
+
+
+def _int_bound(image_dtype, kernels):
+    """Largest |output| of integer images with integer kernels"""
+    info = np.iinfo(image_dtype)
+    weight = np.abs(kernels.astype(np.int64)).sum(axis=(0, 1, 2)).max(
+        initial=0)
+    return max(-int(info.min), int(info.max)) * int(weight)
+
+
+def conv_dtypes(image_dtype, kernels, dtype=None):
+    """
+    (compute, store) dtypes of a convolution
+
+    Integer images with integer kernels accumulate exactly in the
+    narrowest of int16, int32 and int64 that holds the largest possible
+    output (the largest image magnitude times the sum of |kernel|);
+    when even int64 cannot hold it (int64 and uint64 images), int64,
+    which wraps on overflow as numpy integer arithmetic does.
+    Anything else computes in the common float type of images and
+    kernels, at least float32, so float32 stays float32 end to end and
+    float64 stays float64. A float dtype sets the storage type and
+    the compute type, or float32 if narrower (float16 storage over
+    float32 arithmetic); contract casts the patches and kernels to
+    compute, so e.g. float64 images with dtype=float32 are multiplied
+    in float32.
+
+    Args:
+        image_dtype: dtype of the images
+        kernels: numpy.ndarray with shape (kh, kw, c, nc)
+        dtype: storage dtype of the result, None to keep compute
+    """
+    image_dtype = np.dtype(image_dtype)
+    if (np.issubdtype(image_dtype, np.integer) and
+            np.issubdtype(kernels.dtype, np.integer)):
+        bound = _int_bound(image_dtype, kernels)
+        compute = next((np.dtype(t) for t in (np.int16, np.int32)
+                        if bound <= np.iinfo(t).max), np.dtype(np.int64))
+    elif dtype is not None and np.issubdtype(dtype, np.floating):
+        compute = np.promote_types(dtype, np.float32)
+    else:
+        compute = np.result_type(image_dtype, kernels.dtype, np.float32)
+    store = compute if dtype is None else np.dtype(dtype)
+    return compute, store
+
+
+def gemm_dtype(image_dtype, kernels, compute):
+    """
+    dtype contract multiplies in: compute for floats, float32 or
+    float64 for integers whose output bound they hold exactly, else
+    compute (the integer tap loop)
+    """
+    if not np.issubdtype(compute, np.integer):
+        return np.dtype(compute)
+    bound = _int_bound(image_dtype, kernels)
+    if bound <= 2 ** 24:
+        return np.dtype(np.float32)
+    if bound <= 2 ** 53:
+        return np.dtype(np.float64)
+    return np.dtype(compute)
+
+
+def slab_dtype(image_dtype, compute):
+    """
+    dtype the images are zero-padded into: compute for floats, so the
+    im2col copy contract makes is not also a cast (numpy casts a
+    strided view through a second buffer of the copy's size), else the
+    image dtype, which the integer paths cast themselves
+    """
+    if np.issubdtype(compute, np.integer):
+        return np.dtype(image_dtype)
+    return np.dtype(compute)
+
+
+def step_itemsizes(image_dtype, kernels, compute, result=None):
+    """
+    (itemsize, extra, slab_itemsize) of one contract call for
+    plan_tiles
+
+    itemsize is that of the GEMM dtype, which the im2col copy and the
+    GEMM output are built in; extra is the bytes per output element
+    of the buffers on top of those: the cast to result (compute when
+    None) and, for the integer tap loop, its per-tap product;
+    slab_itemsize is that of slab_dtype.
+    """
+    compute = np.dtype(compute)
+    result = compute if result is None else np.dtype(result)
+    gemm = gemm_dtype(image_dtype, kernels, compute)
+    extra = 0 if result == gemm else result.itemsize
+    if np.issubdtype(gemm, np.integer):
+        extra += gemm.itemsize
+    return gemm.itemsize, extra, slab_dtype(image_dtype, compute).itemsize
+
+
+def contract(patches, kernels, compute, result=None):
+    """
+    Sums patches (m, new_h, new_w, kh, kw, c) against kernels
+    (kh, kw, c, nc) in the compute dtype
+
+    Floats go through one tensordot (GEMM) in compute, so patches of
+    another dtype are cast first (see slab_dtype). BLAS has no integer
+    GEMM, but every partial sum of integer inputs is an integer no
+    larger than the output bound, so a float32 GEMM is exact up to
+    2**24 and a float64 one up to 2**53 (see gemm_dtype); the patches
+    are cast to it once, as the im2col copy, and the result is then
+    cast to result (compute when None). Beyond that, integers
+    accumulate one kernel tap at a time in compute.
+    """
+    result = compute if result is None else result
+    gemm = gemm_dtype(patches.dtype, kernels, compute)
+    if not np.issubdtype(compute, np.integer):
+        output = np.tensordot(patches.astype(compute, copy=False),
+                              kernels.astype(compute, copy=False),
+                              axes=([3, 4, 5], [0, 1, 2]))
+        return output.astype(result, copy=False)
+    if not np.issubdtype(gemm, np.integer):
+        output = np.tensordot(patches.astype(gemm, order='C'),
+                              kernels.astype(gemm),
+                              axes=([3, 4, 5], [0, 1, 2]))
+        return output.astype(result, copy=False)
+    kernels = kernels.astype(compute)
+    m, new_h, new_w, kh, kw, c = patches.shape
+    output = np.zeros((m, new_h, new_w, kernels.shape[3]), dtype=compute)
+    for i in range(kh):
+        for j in range(kw):
+            tap = patches[:, :, :, i, j, :].astype(compute, copy=False)
+            output += np.matmul(tap, kernels[i, j])
+    return output.astype(result, copy=False)
+
+
+def conv2d(images, kernels, padding='same', stride=(1, 1),
+           dilation=(1, 1), dtype=None):
+    """
+    Convolution of (m, h, w, c) images with (kh, kw, c, nc) kernels
+
+    The patches are taken as a strided view (no copy) and contracted
+    with every kernel at once in a single tensordot (GEMM), in the
+    dtypes picked by conv_dtypes.
+
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w, nc)
+    """
+    m, h, w, c = images.shape
+    kh, kw, kc, nc = kernels.shape
+    if c != kc:
+        raise ValueError(
+            "Number of channels in the image and kernel should be the same")
+    pads = pad_amounts(h, w, kh, kw, padding, stride, dilation)
+    out_hw = output_size(h, w, kh, kw, pads, stride, dilation)
+    compute, store = conv_dtypes(images.dtype, kernels, dtype)
+    padded = pad_images(images.astype(slab_dtype(images.dtype, compute),
+                                      copy=False), pads)
+    patches = windows(padded, kh, kw, stride, dilation, out_hw)
+    return contract(patches, kernels, compute, store)
+
+
+def _next_pow2(n):
+    """Smallest power of two >= n"""
+    return 1 << max(0, int(n - 1).bit_length())
+
+
+def fft_tile(kh, kw, h, w):
+    """
+    FFT block size (fh, fw) for overlap-add
+
+    A power of two of about twice the kernel (at least 64), capped at
+    what the padded image needs, so a block keeps most of its area as
+    useful output while its transform stays small.
+    """
+    fh = min(max(64, _next_pow2(2 * kh)), _next_pow2(h + kh - 1))
+    fw = min(max(64, _next_pow2(2 * kw)), _next_pow2(w + kw - 1))
+    return fh, fw
+
+
+def fft_conv2d(padded, kernel, stride, out_hw, tile=None,
+               dtype=np.float64):
+    """
+    Convolution of padded (m, h, w, c) images with one (kh, kw, c)
+    kernel by FFT, summing over channels in the frequency domain
+
+    The image is cut into blocks that are transformed separately and
+    overlap-added into the full result, so the FFT buffers are bounded
+    by the block size rather than the image size.
+
+    Args:
+        padded: numpy.ndarray with shape (m, h, w, c), already padded
+        kernel: numpy.ndarray with shape (kh, kw, c)
+        stride: (sh, sw)
+        out_hw: (new_h, new_w) of the strided output
+        tile: FFT block size (fh, fw), see fft_tile when None
+        dtype: float dtype of the transforms and the result (float32
+            runs complex64 FFTs)
+
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w)
+    """
+    m, h, w, c = padded.shape
+    kh, kw, _ = kernel.shape
+    fh, fw = tile if tile is not None else fft_tile(kh, kw, h, w)
+    fh, fw = max(fh, kh), max(fw, kw)
+    bh, bw = fh - kh + 1, fw - kw + 1
+    # The convolve functions correlate, i.e. convolve with the kernel
+    # flipped; its transform is shared by every block
+    k_hat = np.fft.rfft2(kernel[::-1, ::-1, :].astype(dtype), s=(fh, fw),
+                         axes=(0, 1))
+    full = np.zeros((m, h + kh - 1, w + kw - 1), dtype=dtype)
+    for y in range(0, h, bh):
+        for x in range(0, w, bw):
+            block = padded[:, y:y + bh, x:x + bw, :].astype(dtype,
+                                                            copy=False)
+            b_hat = np.fft.rfft2(block, s=(fh, fw), axes=(1, 2))
+            prod = np.einsum('mijc,ijc->mij', b_hat, k_hat)
+            piece = np.fft.irfft2(prod, s=(fh, fw), axes=(1, 2))
+            ph = min(fh, block.shape[1] + kh - 1)
+            pw = min(fw, block.shape[2] + kw - 1)
+            full[:, y:y + ph, x:x + pw] += piece[:, :ph, :pw]
+    sh, sw = stride
+    new_h, new_w = out_hw
+    return full[:, kh - 1:kh - 1 + (new_h - 1) * sh + 1:sh,
+                kw - 1:kw - 1 + (new_w - 1) * sw + 1:sw]
+
+
+def choose_method(h, w, kh, kw, c, pads, stride, method='auto',
+                  separable=False):
+    """
+    Picks 'direct', 'fft' or 'separable' for a single-kernel convolution
+
+    Cost model per image: the direct form does kh*kw*c multiply-adds
+    per output pixel, while overlap-add FFT does c + 1 transforms of
+    fh*fw*log2(fh*fw) per block and computes every (unstrided) pixel.
+    With numpy's FFT and a single-kernel GEMM the two unit costs are
+    about equal; FFT starts to win around 7x7 kernels.
+
+    When separable is True the choice is between 'separable' and 'fft'
+    only, since kh + kw taps per pixel never cost more than the direct
+    form's kh * kw. Each tap is a whole-array update that measures
+    about three FFT units, so the 1-D passes win up to about 5x5.
+    """
+    if method in ('direct', 'fft'):
+        return method
+    if method != 'auto':
+        raise ValueError("method must be 'direct', 'fft' or 'auto'")
+    ph, pw = pads
+    hp, wp = h + 2 * ph, w + 2 * pw
+    new_h, new_w = output_size(h, w, kh, kw, pads, stride)
+    direct = float(new_h * new_w) * kh * kw * c
+    fh, fw = fft_tile(kh, kw, hp, wp)
+    blocks = (-(-hp // max(1, fh - kh + 1)) *
+              -(-wp // max(1, fw - kw + 1)))
+    fft = blocks * (c + 1) * fh * fw * np.log2(fh * fw)
+    if separable:
+        taps = 3.0 * (kh + kw) * c * hp * new_w
+        return 'fft' if fft < taps else 'separable'
+    return 'fft' if fft < direct else 'direct'
+
+
+def separate(kernel, rtol=None):
+    """
+    Factors a rank-1 (kh, kw) kernel as outer(col, row)
+
+    The rank is read from the SVD: the kernel is separable when its
+    second singular value is below rtol times the first (Gaussian, box
+    and Sobel filters are). rtol defaults to 1e-10, or to the rounding
+    level of a lower-precision float kernel (float32, float16).
+
+    Returns:
+        (col, row) with shapes (kh,) and (kw,), or None if the kernel
+        is not separable
+    """
+    kernel = np.asarray(kernel)
+    if rtol is None:
+        rtol = 1e-10
+        if np.issubdtype(kernel.dtype, np.floating):
+            rtol = max(rtol, 10 * max(kernel.shape) *
+                       np.finfo(kernel.dtype).eps)
+    u, s, vt = np.linalg.svd(kernel.astype(np.float64))
+    if s[0] == 0:
+        return np.zeros(kernel.shape[0]), np.zeros(kernel.shape[1])
+    if len(s) > 1 and s[1] > rtol * s[0]:
+        return None
+    scale = np.sqrt(s[0])
+    return u[:, 0] * scale, vt[0] * scale
+
+
+def kernel_factors(kernel, separable=None):
+    """
+    (col, row) factors for the separable path of a grayscale convolve
+
+    Args:
+        kernel: numpy.ndarray with shape (kh, kw)
+        separable: None to detect them with separate, False to turn the
+            separable path off, or the caller's own (col, row)
+
+    Returns:
+        (col, row), or None when the full 2-D kernel must be used
+    """
+    if separable is None:
+        return separate(kernel)
+    if separable is False:
+        return None
+    col, row = (np.asarray(f, dtype=np.float64).ravel() for f in separable)
+    if (len(col), len(row)) != kernel.shape:
+        raise ValueError("separable factors must have lengths (kh, kw)")
+    return col, row
+
+
+def separable_conv2d(padded, col, row, stride=(1, 1), dtype=np.float64):
+    """
+    Convolution of padded (m, h, w) images with outer(col, row) as two
+    1-D passes
+
+    A pass along rows with row (kw taps) and one along columns with col
+    (kh taps) cost kh + kw multiply-adds per output pixel instead of
+    kh * kw. Each pass is a loop over taps of whole-array updates, in
+    dtype.
+
+    Returns:
+        numpy.ndarray with shape (m, new_h, new_w)
+    """
+    m, h, w = padded.shape
+    kh, kw = len(col), len(row)
+    sh, sw = stride
+    new_h, new_w = output_size(h, w, kh, kw, (0, 0), stride)
+    span_h, span_w = (new_h - 1) * sh + 1, (new_w - 1) * sw + 1
+    col, row = col.astype(dtype), row.astype(dtype)
+    rows = np.zeros((m, span_h + kh - 1, new_w), dtype=dtype)
+    for j in range(kw):
+        rows += row[j] * padded[:, :span_h + kh - 1, j:j + span_w:sw]
+    output = np.zeros((m, new_h, new_w), dtype=dtype)
+    for i in range(kh):
+        output += col[i] * rows[:, i:i + span_h:sh]
+    return output
+
+
+def plan_tiles(m, h, w, c, kh, kw, nc, pads, stride, dilation, max_bytes,
+               itemsize=8, extra=0, slab_itemsize=None):
+    """
+    Chooses (images per chunk, output rows per tile) under a budget
+
+    A step holds a zero-padded input slab (of slab_itemsize, itemsize
+    when None), its im2col matrix (the tensordot copy of the patch
+    view), its output block and the kernels cast for the GEMM, sized
+    with itemsize, plus extra bytes per output element (see
+    step_itemsizes); the plan takes as many output rows as fit for one
+    image, then as many images as fit with that many rows. A few KiB
+    of max_bytes are left for array headers and views.
+
+    Raises:
+        ValueError: if a single output row of a single image does not
+            fit in max_bytes
+    """
+    ph, pw = pads
+    sh, _ = stride
+    ekh = (kh - 1) * dilation[0] + 1
+    new_h, new_w = output_size(h, w, kh, kw, pads, stride, dilation)
+
+    slab_itemsize = itemsize if slab_itemsize is None else slab_itemsize
+    max_bytes -= itemsize * kh * kw * c * nc + _OVERHEAD_BYTES
+
+    def step_bytes(rows):
+        """Bytes one image needs for a tile of rows output rows"""
+        slab = ((rows - 1) * sh + ekh) * (w + 2 * pw) * c
+        cols = rows * new_w * kh * kw * c
+        return (slab_itemsize * slab +
+                itemsize * (cols + rows * new_w * nc) +
+                extra * rows * new_w * nc)
+
+    if step_bytes(1) > max_bytes:
+        raise ValueError("max_bytes is too small for one output row")
+    # Largest row count that fits (step_bytes grows with rows)
+    low, high = 1, new_h
+    while low < high:
+        mid = (low + high + 1) // 2
+        if step_bytes(mid) <= max_bytes:
+            low = mid
+        else:
+            high = mid - 1
+    rows = low
+    batch = max(1, min(m, max_bytes // step_bytes(rows)))
+    return int(batch), rows
+
+
+def conv_rows(images, kernels, pads, stride, dilation, rows, new_w,
+              compute, result=None):
+    """
+    Output rows [r0, r1) of the convolution of a chunk of images
+
+    Only the input rows those outputs read are zero-padded, into a slab
+    of their own, so the padded batch is never built.
+
+    Args:
+        images: numpy.ndarray (or memory map) with shape (m, h, w, c)
+        kernels: numpy.ndarray with shape (kh, kw, c, nc)
+        pads: (ph, pw) of the whole convolution
+        stride, dilation: as for conv2d
+        rows: (r0, r1), output rows to compute
+        new_w: output width
+        compute: compute dtype (see conv_dtypes)
+        result: dtype of the returned block, compute when None
+
+    Returns:
+        numpy.ndarray with shape (m, r1 - r0, new_w, nc)
+    """
+    m, h, w, c = images.shape
+    kh, kw = kernels.shape[:2]
+    ph, pw = pads
+    r0, r1 = rows
+    # Padded-coordinate input rows [top, bottom) for this tile
+    top = r0 * stride[0]
+    bottom = (r1 - 1) * stride[0] + (kh - 1) * dilation[0] + 1
+    slab = np.zeros((m, bottom - top, w + 2 * pw, c),
+                    dtype=slab_dtype(images.dtype, compute))
+    src0, src1 = max(top - ph, 0), min(bottom - ph, h)
+    if src1 > src0:
+        slab[:, src0 + ph - top:src1 + ph - top, pw:pw + w] = \
+            images[:, src0:src1]
+    patches = windows(slab, kh, kw, stride, dilation, (r1 - r0, new_w))
+    return contract(patches, kernels, compute, result)
+
+
+def conv2d_tiled(images, kernels, padding='same', stride=(1, 1),
+                 dilation=(1, 1), max_bytes=256 * 2 ** 20, out=None,
+                 dtype=None):
+    """
+    conv2d in chunks of images and tiles of output rows
+
+    Each step zero-pads only the input rows its tile needs, so the
+    padded batch and the full im2col matrix are never built, and peak
+    working memory stays under max_bytes (besides images and out).
+
+    Args:
+        images: numpy.ndarray (or memory map) with shape (m, h, w, c)
+        kernels: numpy.ndarray with shape (kh, kw, c, nc)
+        padding, stride, dilation: as for conv2d
+        max_bytes: hard budget for the per-step temporaries
+        out: numpy.ndarray or memory map of the output shape to write
+            into, or a path for a new .npy memory map; a new array is
+            allocated when None
+        dtype: as for conv2d; sets the dtype of a new out
+
+    Returns:
+        out, filled with the (m, new_h, new_w, nc) convolution
+    """
+    m, h, w, c = images.shape
+    kh, kw, kc, nc = kernels.shape
+    if c != kc:
+        raise ValueError(
+            "Number of channels in the image and kernel should be the same")
+    ph, pw = pad_amounts(h, w, kh, kw, padding, stride, dilation)
+    new_h, new_w = output_size(h, w, kh, kw, (ph, pw), stride, dilation)
+    shape = (m, new_h, new_w, nc)
+    compute, store = conv_dtypes(images.dtype, kernels, dtype)
+    if out is None:
+        out = np.empty(shape, dtype=store)
+    elif isinstance(out, str):
+        out = np.lib.format.open_memmap(out, mode='w+', dtype=store,
+                                        shape=shape)
+    elif out.shape != shape:
+        raise ValueError("out must have shape {}".format(shape))
+
+    batch, rows = plan_tiles(m, h, w, c, kh, kw, nc, (ph, pw), stride,
+                             dilation, max_bytes,
+                             *step_itemsizes(images.dtype, kernels, compute))
+    for i0 in range(0, m, batch):
+        i1 = min(m, i0 + batch)
+        for r0 in range(0, new_h, rows):
+            r1 = min(new_h, r0 + rows)
+            out[i0:i1, r0:r1] = conv_rows(images[i0:i1], kernels, (ph, pw),
+                                          stride, dilation, (r0, r1),
+                                          new_w, compute)
+    return out
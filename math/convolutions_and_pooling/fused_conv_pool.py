@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Fused convolution + bias + activation + pooling"""
+
+
+import numpy as np
+
+engine = __import__('conv_engine')
+pool = __import__('6-pool').pool
+
+
+def relu(x):
+    """ReLU, in place"""
+    return np.maximum(x, 0, out=x)
+
+
+def sigmoid(x):
+    """Logistic sigmoid, in place"""
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+ACTIVATIONS = {'relu': relu, 'sigmoid': sigmoid, None: lambda x: x}
+
+
+def conv_pool(images, kernels, bias=None, activation='relu',
+              pool_shape=(2, 2), pool_stride=None, pool_mode='max',
+              padding='same', stride=(1, 1), max_bytes=64 * 2 ** 20,
+              dtype=None):
+    """
+    pool(activation(convolve(images, kernels) + bias)) in one pass
+
+    The convolution is computed a chunk of images and a band of rows
+    at a time (see conv_engine.conv_rows), each band exactly the rows
+    one band of pooled rows reads, and is pooled before the next band
+    is computed, so the full-resolution (m, new_h, new_w, nc)
+    intermediate is never built. A per-channel bias passes through
+    max and avg pooling unchanged, and ReLU and sigmoid are monotonic
+    and pass through max pooling, so those are applied to the pooled
+    band, which is pool_shape times smaller.
+
+    Args:
+        images: numpy.ndarray with shape (m, h, w, c)
+        kernels: numpy.ndarray with shape (kh, kw, c, nc)
+        bias: per-kernel bias of nc values, e.g. shape (1, 1, 1, nc)
+        activation: 'relu', 'sigmoid' or None
+        pool_shape: tuple (ph, pw) of the pooling window
+        pool_stride: tuple, pool_shape when None
+        pool_mode: 'max' or 'avg'
+        padding, stride: of the convolution, as for convolve
+        max_bytes: working-memory budget of one band
+        dtype: storage dtype, as for convolve (integer inputs are
+            computed in float32)
+    Returns:
+        numpy.ndarray with shape (m, pooled_h, pooled_w, nc)
+    """
+    if activation not in ACTIVATIONS:
+        raise ValueError("activation must be 'relu', 'sigmoid' or None")
+    if pool_mode not in ('max', 'avg'):
+        raise ValueError("Mode should be either 'max' or 'avg'")
+    m, h, w, c = images.shape
+    kh, kw, kc, nc = kernels.shape
+    if c != kc:
+        raise ValueError(
+            "Number of channels in the image and kernel should be the same")
+    pool_stride = pool_stride or pool_shape
+    pkh, pkw = pool_shape
+    psh, _ = pool_stride
+
+    pads = engine.pad_amounts(h, w, kh, kw, padding, stride)
+    new_h, new_w = engine.output_size(h, w, kh, kw, pads, stride)
+    out_h, out_w = engine.output_size(new_h, new_w, pkh, pkw, (0, 0),
+                                      pool_stride)
+    compute, store = engine.conv_dtypes(images.dtype, kernels, dtype)
+    real = np.dtype(compute if np.issubdtype(compute, np.floating)
+                    else np.float32)
+    output = np.empty((m, out_h, out_w, nc),
+                      dtype=real if dtype is None else store)
+    bias = None if bias is None else np.asarray(bias, real).reshape(nc)
+    act = ACTIVATIONS[activation]
+    late = pool_mode == 'max'
+
+    # Pooling a band needs at most one more band-sized buffer
+    itemsize, extra, slab_itemsize = engine.step_itemsizes(
+        images.dtype, kernels, compute, real)
+    batch, rows = engine.plan_tiles(m, h, w, c, kh, kw, nc, pads, stride,
+                                    (1, 1), max_bytes, itemsize,
+                                    extra + real.itemsize, slab_itemsize)
+    band = max(1, (rows - pkh) // psh + 1)
+    for i0 in range(0, m, batch):
+        i1 = min(m, i0 + batch)
+        for p0 in range(0, out_h, band):
+            p1 = min(out_h, p0 + band)
+            conv = engine.conv_rows(images[i0:i1], kernels, pads, stride,
+                                    (1, 1), (p0 * psh, (p1 - 1) * psh + pkh),
+                                    new_w, compute, real)
+            if not late:
+                if bias is not None:
+                    conv += bias
+                act(conv)
+            pooled = pool(conv, pool_shape, pool_stride, pool_mode)
+            if late:
+                if bias is not None:
+                    pooled += bias
+                act(pooled)
+            output[i0:i1, p0:p1] = pooled
+            # Free this band before the next one is computed
+            del conv, pooled
+    return output
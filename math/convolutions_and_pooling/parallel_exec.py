@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Multi-core executor for the convolution and pooling functions"""
+
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+_convolve = __import__('5-convolve').convolve
+_convolve_channels = __import__('4-convolve_channels').convolve_channels
+_pool = __import__('6-pool').pool
+
+
+def shards(n, workers):
+    """
+    Splits range(n) into at most workers contiguous (start, stop) pieces
+    of near-equal size
+    """
+    workers = max(1, min(workers, n))
+    step, extra = divmod(n, workers)
+    bounds = []
+    start = 0
+    for i in range(workers):
+        stop = start + step + (1 if i < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _split_args(images, args, split, start, stop):
+    """Inputs of one shard: images and args sliced on the split axis"""
+    if split == 'm':
+        return images[start:stop], args
+    return images, (args[0][..., start:stop],) + tuple(args[1:])
+
+
+def _out_index(split, start, stop):
+    """Index of one shard in the output"""
+    if split == 'm':
+        return np.s_[start:stop]
+    return np.s_[..., start:stop]
+
+
+def _attach(name, shape, dtype):
+    """Opens a shared memory block and its array view"""
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _process_shard(task):
+    """Computes one shard in a worker process, in place in shared memory"""
+    fn, args, kwargs, split, bounds, src, dst = task
+    shm_in, images = _attach(*src)
+    shm_out, out = _attach(*dst)
+    part_images, part_args = _split_args(images, args, split, *bounds)
+    out[_out_index(split, *bounds)] = fn(part_images, *part_args, **kwargs)
+    # The views must go before the blocks can be closed
+    del images, out, part_images
+    shm_in.close()
+    shm_out.close()
+
+
+def run(fn, images, *args, workers=None, backend='thread', split='m',
+        **kwargs):
+    """
+    Calls fn(images, *args, **kwargs) in parallel shards
+
+    The batch axis m of images (split='m'), or the last axis of args[0]
+    (split='nc', the kernels of convolve), is cut into one contiguous
+    shard per worker, and every shard is written into its slice of one
+    preallocated output.
+
+    With backend='thread' the shards run in a thread pool on the same
+    arrays: numpy releases the GIL inside BLAS and ufuncs, so the
+    threads run on separate cores without copying anything. With
+    backend='process' images and the output live in shared memory that
+    worker processes attach to, for functions that hold the GIL.
+
+    For a clean speedup keep BLAS itself single-threaded
+    (OMP_NUM_THREADS=1), otherwise the workers compete for cores.
+
+    Args:
+        fn: convolve, convolve_channels or pool (any function whose
+            output keeps the batch axis first, and with split='nc' the
+            kernel axis last)
+        images: numpy.ndarray with shape (m, h, w, ...)
+        workers: number of shards, os.cpu_count() when None
+        backend: 'thread' or 'process'
+        split: 'm' or 'nc'
+    Returns:
+        numpy.ndarray, the same as fn(images, *args, **kwargs)
+    """
+    if backend not in ('thread', 'process'):
+        raise ValueError("backend must be 'thread' or 'process'")
+    if split not in ('m', 'nc'):
+        raise ValueError("split must be 'm' or 'nc'")
+    n = images.shape[0] if split == 'm' else args[0].shape[-1]
+    bounds = shards(n, workers or os.cpu_count() or 1)
+
+    if len(bounds) == 1:
+        return fn(images, *args, **kwargs)
+
+    # Output shape and dtype from an empty batch with all the kernels:
+    # the dtype of integer convolutions depends on every kernel, so it
+    # cannot come from an empty (or any single) kernel shard
+    empty = fn(images[:0], *args, **kwargs)
+    shape = list(empty.shape)
+    shape[0] = images.shape[0]
+    shape[-1] = n if split == 'nc' else shape[-1]
+
+    if backend == 'thread':
+        out = np.empty(shape, dtype=empty.dtype)
+
+        def work(start_stop):
+            """Computes one shard into out"""
+            part_images, part_args = _split_args(images, args, split,
+                                                 *start_stop)
+            out[_out_index(split, *start_stop)] = fn(part_images,
+                                                     *part_args, **kwargs)
+
+        with ThreadPoolExecutor(len(bounds)) as executor:
+            list(executor.map(work, bounds))
+        return out
+
+    images = np.ascontiguousarray(images)
+    shm_in = SharedMemory(create=True, size=max(1, images.nbytes))
+    shm_out = SharedMemory(create=True,
+                           size=max(1, int(np.prod(shape)) *
+                                    empty.dtype.itemsize))
+    try:
+        np.ndarray(images.shape, images.dtype, buffer=shm_in.buf)[...] = \
+            images
+        src = (shm_in.name, images.shape, images.dtype)
+        dst = (shm_out.name, tuple(shape), empty.dtype)
+        tasks = [(fn, args, kwargs, split, b, src, dst) for b in bounds]
+        with Pool(len(bounds)) as pool:
+            pool.map(_process_shard, tasks)
+        return np.ndarray(shape, empty.dtype, buffer=shm_out.buf).copy()
+    finally:
+        shm_in.close()
+        shm_in.unlink()
+        shm_out.close()
+        shm_out.unlink()
+
+
+def convolve(images, kernels, padding='same', stride=(1, 1),
+             workers=None, backend='thread', split='m'):
+    """
+    Parallel 5-convolve.convolve, sharded over images (split='m') or
+    kernels (split='nc', for small batches)
+    """
+    return run(_convolve, images, kernels, padding, stride,
+               workers=workers, backend=backend, split=split)
+
+
+def convolve_channels(images, kernel, padding='same', stride=(1, 1),
+                      workers=None, backend='thread'):
+    """Parallel 4-convolve_channels.convolve_channels, sharded over m"""
+    return run(_convolve_channels, images, kernel, padding, stride,
+               workers=workers, backend=backend)
+
+
+def pool(images, kernel_shape, stride, mode='max', workers=None,
+         backend='thread'):
+    """Parallel 6-pool.pool, sharded over m"""
+    return run(_pool, images, kernel_shape, stride, mode,
+               workers=workers, backend=backend)
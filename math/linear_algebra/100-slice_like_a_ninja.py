@@ -4,20 +4,31 @@ This module contains a function np_slice that slices
 a NumPy ndarray along specific axes.
 """
 
+import numpy as np
 
-def np_slice(matrix, axes={}):
+
+def np_slice(matrix, axes={}, out=None):
     """
     Slices a NumPy ndarray along given axes.
 
+    Only basic slices are built, so the result is always a view that
+    shares memory with matrix and nothing is copied.
+
     Args:
         matrix (numpy.ndarray): Input array
         axes (dict): Dictionary where the key is an axis index
                      and the value is a tuple specifying the slice
+        out (numpy.ndarray, optional): Buffer of the sliced shape to
+                                       copy the slice into
 
     Returns:
-        numpy.ndarray: The sliced array
+        numpy.ndarray: The sliced array (a view), or out filled with it
     """
     # Build slice objects for each axis
     slices = [slice(*axes.get(i, (None, None, None)))
               for i in range(matrix.ndim)]
-    return matrix[tuple(slices)]
+    view = matrix[tuple(slices)]
+    if out is None:
+        return view
+    np.copyto(out, view)
+    return out
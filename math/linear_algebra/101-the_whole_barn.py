@@ -4,6 +4,8 @@ This module defines a function add_matrices
 that adds two matrices of arbitrary depth.
 """
 
+flat = __import__('flat_matrix')
+
 
 def add_matrices(mat1, mat2):
     """
@@ -15,8 +17,12 @@ def add_matrices(mat1, mat2):
 
     Returns:
         list: New matrix containing the sums
+        FlatMatrix: if either input is a FlatMatrix
         None: If mat1 and mat2 are not the same shape
     """
+    if flat.any_flat(mat1, mat2):
+        return flat.as_flat(mat1).add(flat.as_flat(mat2))
+
     if type(mat1) != type(mat2):
         return None
 
@@ -1,21 +1,36 @@
 #!/usr/bin/env python3
 """
 This module defines a function cat_matrices
-that concatenates two matrices along a given axis.
+that concatenates two matrices along a given axis,
+and cat_matrices_many that joins any number of them at once.
 """
 
+flat = __import__('flat_matrix')
+
 
 def shape(matrix):
     """Return the shape of a nested list (matrix)."""
+    if isinstance(matrix, flat.FlatMatrix):
+        return matrix.shape
     if isinstance(matrix, list):
         return (len(matrix),) + shape(matrix[0])
     return ()
 
 
+def _cat(mat1, mat2, axis):
+    """Concatenate nested lists whose shapes are already checked."""
+    if axis == 0:
+        return mat1 + mat2
+    return [_cat(a, b, axis - 1) for a, b in zip(mat1, mat2)]
+
+
 def cat_matrices(mat1, mat2, axis=0):
     """
     Concatenates two matrices (nested lists) along a specific axis.
 
+    The shapes are computed and checked once up front, not again at
+    every level of the recursion.
+
     Args:
         mat1 (list): First matrix
         mat2 (list): Second matrix
@@ -23,8 +38,12 @@ def cat_matrices(mat1, mat2, axis=0):
 
     Returns:
         list: New concatenated matrix
+        FlatMatrix: if either input is a FlatMatrix
         None: If shapes are incompatible
     """
+    if flat.any_flat(mat1, mat2):
+        return flat.as_flat(mat1).concatenate(flat.as_flat(mat2), axis)
+
     sh1, sh2 = shape(mat1), shape(mat2)
 
     if len(sh1) != len(sh2):
@@ -35,8 +54,55 @@ def cat_matrices(mat1, mat2, axis=0):
         if i != axis and d1 != d2:
             return None
 
+    return _cat(mat1, mat2, axis)
+
+
+def _cat_many(mats, axis):
+    """Concatenate many nested lists whose shapes are already checked."""
     if axis == 0:
-        return mat1 + mat2
+        out = [None] * sum(len(m) for m in mats)
+        pos = 0
+        for m in mats:
+            out[pos:pos + len(m)] = m
+            pos += len(m)
+        return out
+    return [_cat_many([m[i] for m in mats], axis - 1)
+            for i in range(len(mats[0]))]
+
+
+def cat_matrices_many(matrices, axis=0):
+    """
+    Concatenates any number of matrices (nested lists or FlatMatrix)
+    along a specific axis in a single pass.
+
+    Joining k matrices pairwise with cat_matrices copies the growing
+    result every time, O(k^2) in total; here every shape is checked
+    once and each output list is allocated once and filled in place.
+
+    Args:
+        matrices (iterable): Matrices to join, e.g. a generator
+        axis (int): Axis to concatenate along
+
+    Returns:
+        list: New concatenated matrix
+        FlatMatrix: if any input is a FlatMatrix
+        None: If there is no input or the shapes are incompatible
+    """
+    mats = list(matrices)
+    if not mats:
+        return None
+
+    shapes = [shape(m) for m in mats]
+    first = shapes[0]
+    if not 0 <= axis < len(first):
+        return None
+    for sh in shapes[1:]:
+        if len(sh) != len(first):
+            return None
+        for i, (d1, d2) in enumerate(zip(first, sh)):
+            if i != axis and d1 != d2:
+                return None
 
-    # Recurse into sublists
-    return [cat_matrices(a, b, axis=axis - 1) for a, b in zip(mat1, mat2)]
+    if flat.any_flat(*mats):
+        return flat.concatenate_many([flat.as_flat(m) for m in mats], axis)
+    return _cat_many(mats, axis)
@@ -4,15 +4,23 @@ This module contains a function np_transpose that returns
 the transpose of a NumPy ndarray.
 """
 
+import numpy as np
 
-def np_transpose(matrix):
+
+def np_transpose(matrix, out=None):
     """
     Returns the transpose of a NumPy ndarray.
 
     Args:
         matrix (numpy.ndarray): Input array
+        out (numpy.ndarray, optional): Buffer with the transposed shape
+                                       to copy the transpose into
 
     Returns:
-        numpy.ndarray: Transposed array (new view of the data)
+        numpy.ndarray: Transposed array (new view of the data, never a
+                       copy), or out filled with it
     """
-    return matrix.T
+    if out is None:
+        return matrix.T
+    np.copyto(out, matrix.T)
+    return out
@@ -5,14 +5,23 @@ element-wise addition, subtraction, multiplication, and
 division on NumPy arrays.
 """
 
+import numpy as np
 
-def np_elementwise(mat1, mat2):
+
+def np_elementwise(mat1, mat2, out=None):
     """
     Performs element-wise arithmetic operations on two arrays.
 
     Args:
         mat1 (numpy.ndarray or scalar): First input
         mat2 (numpy.ndarray or scalar): Second input
+        out (tuple, optional): Four buffers (sum, difference, product,
+                               quotient) to write the results into
+                               instead of allocating them; an entry
+                               may be None to allocate that one.
+                               mat1 itself may be reused as the
+                               quotient buffer, which is written last,
+                               for an in-place update.
 
     Returns:
         tuple: (sum, difference, product, quotient)
@@ -21,4 +30,10 @@ def np_elementwise(mat1, mat2):
             - product: element-wise multiplication
             - quotient: element-wise division
     """
-    return mat1 + mat2, mat1 - mat2, mat1 * mat2, mat1 / mat2
+    if out is None:
+        return mat1 + mat2, mat1 - mat2, mat1 * mat2, mat1 / mat2
+    if len(out) != 4:
+        raise ValueError("out must hold four buffers")
+    ufuncs = (np.add, np.subtract, np.multiply, np.true_divide)
+    return tuple(ufunc(mat1, mat2, out=buf) for ufunc, buf in
+                 zip(ufuncs, out))
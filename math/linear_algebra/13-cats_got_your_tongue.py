@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """
 This module contains a function np_cat that concatenates
-two NumPy arrays along a specified axis.
+two NumPy arrays along a specified axis, np_cat_many that joins
+any number of arrays at once, and NpyCatWriter that streams a
+concatenation into a .npy file too large to hold in memory.
 """
 
+import os
+import struct
+
 import numpy as np
 
+# Bytes reserved for a streamed .npy header, enough for any shape
+_HEADER_LEN = 256
+
 
-def np_cat(mat1, mat2, axis=0):
+def np_cat(mat1, mat2, axis=0, out=None):
     """
     Concatenates two NumPy arrays along a given axis.
 
@@ -16,8 +24,223 @@ def np_cat(mat1, mat2, axis=0):
         mat2 (numpy.ndarray): Second array
         axis (int, optional): Axis along which to concatenate.
                               Defaults to 0.
+        out (numpy.ndarray, optional): Preallocated buffer of the
+                                       result shape to write into
+
+    Returns:
+        numpy.ndarray: Concatenated array (out when given)
+    """
+    return np.concatenate((mat1, mat2), axis=axis, out=out)
+
+
+def np_cat_many(arrays, axis=0, out=None, path=None, dtype=None):
+    """
+    Concatenates any number of NumPy arrays along a given axis.
+
+    Joining k arrays pairwise with np_cat copies the growing result
+    every time, O(k^2) in total. Here the output shape is worked out in
+    one pass, the result is allocated once and each input is copied
+    into its slice exactly once.
+
+    Args:
+        arrays (iterable): Arrays to join, e.g. a generator of shards
+        axis (int, optional): Axis along which to concatenate.
+                              Defaults to 0.
+        out (numpy.ndarray, optional): Preallocated buffer of the
+                                       result shape to write into
+        path (str, optional): Stream the result into this .npy file
+                              instead (see NpyCatWriter); along axis 0
+                              the inputs are consumed one at a time and
+                              never held together
+        dtype (numpy.dtype, optional): dtype of a streamed result; the
+                                       common dtype of the inputs when
+                                       they are all known up front,
+                                       else that of the first one
 
     Returns:
-        numpy.ndarray: Concatenated array
+        numpy.ndarray: Concatenated array (out when given, a read-only
+                       memory map of path when given)
+
+    Raises:
+        ValueError: if there is no input or the shapes do not match
+    """
+    if path is not None:
+        if axis != 0:
+            arrays = [np.asarray(a) for a in arrays]
+            length = sum(a.shape[axis] for a in arrays)
+            if dtype is None and arrays:
+                dtype = np.result_type(*arrays)
+        else:
+            length = None
+        with NpyCatWriter(path, axis=axis, length=length,
+                          dtype=dtype) as writer:
+            for a in arrays:
+                writer.write(a)
+        return writer.result()
+
+    arrays = [np.asarray(a) for a in arrays]
+    if not arrays:
+        raise ValueError("need at least one array to concatenate")
+    first = arrays[0]
+    axis = axis % first.ndim
+    shape = list(first.shape)
+    shape[axis] = 0
+    for a in arrays:
+        if a.ndim != first.ndim or any(
+                d1 != d2 for i, (d1, d2) in
+                enumerate(zip(first.shape, a.shape)) if i != axis):
+            raise ValueError("all input array dimensions except for the "
+                             "concatenation axis must match exactly")
+        shape[axis] += a.shape[axis]
+
+    if out is None:
+        out = np.empty(shape, dtype=np.result_type(*arrays))
+    elif out.shape != tuple(shape):
+        raise ValueError("out must have shape {}".format(tuple(shape)))
+    index = [slice(None)] * first.ndim
+    pos = 0
+    for a in arrays:
+        index[axis] = slice(pos, pos + a.shape[axis])
+        out[tuple(index)] = a
+        pos += a.shape[axis]
+    return out
+
+
+class NpyCatWriter:
+    """
+    Streams a concatenation into a .npy file chunk by chunk.
+
+    Along axis 0 with no length given, each chunk is appended to the
+    file as it arrives and the header is rewritten with the final shape
+    on close, so the total size need not be known up front. Otherwise
+    the file is preallocated as a memory map of the full result (length
+    along axis) and every chunk is written into its slice.
+    Only one chunk is ever in memory.
+
+    The file has dtype, or the dtype of the first chunk when None; as
+    the later chunks are not known yet, one that would not cast to it
+    safely (e.g. floats after ints) raises instead of being truncated.
     """
-    return np.concatenate((mat1, mat2), axis=axis)
+
+    def __init__(self, path, axis=0, length=None, dtype=None):
+        """
+        Args:
+            path (str): .npy file to create
+            axis (int): axis along which chunks are joined
+            length (int, optional): total size along axis; required
+                                    when axis is not 0
+            dtype (numpy.dtype, optional): dtype of the file, every
+                                           chunk is cast to it
+        """
+        if axis != 0 and length is None:
+            raise ValueError("length is required when axis is not 0")
+        self.path = path
+        self.axis = axis
+        self.length = length
+        self.written = 0
+        self._shape = None
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._casting = "unsafe" if dtype is not None else "safe"
+        self._file = None
+        self._memmap = None
+
+    def __enter__(self):
+        """Returns the writer."""
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        """
+        Closes the writer; on an error the incomplete file is removed.
+        """
+        self.close(check=exc_type is None)
+        if exc_type is not None and self._shape is not None:
+            os.remove(self.path)
+
+    def _header(self, shape):
+        """Version 1.0 .npy header padded to _HEADER_LEN bytes."""
+        header = "{{'descr': {!r}, 'fortran_order': False, " \
+                 "'shape': {!r}, }}".format(
+                     np.lib.format.dtype_to_descr(self._dtype),
+                     tuple(shape))
+        body_len = _HEADER_LEN - 10
+        text = header.ljust(body_len - 1) + "\n"
+        return (b"\x93NUMPY\x01\x00" + struct.pack("<H", body_len) +
+                text.encode("latin1"))
+
+    def write(self, chunk):
+        """
+        Appends one array to the concatenation.
+
+        Raises:
+            ValueError: if its shape does not match the earlier chunks,
+                        it overruns length or its dtype does not cast
+                        safely to the file dtype
+        """
+        chunk = np.asarray(chunk)
+        axis = self.axis % chunk.ndim
+        if self._shape is None:
+            self._shape = list(chunk.shape)
+            if self._dtype is None:
+                self._dtype = chunk.dtype
+            if self.length is None:
+                self._file = open(self.path, "wb")
+                self._file.write(self._header(self._shape))
+            else:
+                shape = list(chunk.shape)
+                shape[axis] = self.length
+                self._memmap = np.lib.format.open_memmap(
+                    self.path, mode="w+", dtype=self._dtype,
+                    shape=tuple(shape))
+        elif chunk.ndim != len(self._shape) or any(
+                d1 != d2 for i, (d1, d2) in
+                enumerate(zip(self._shape, chunk.shape)) if i != axis):
+            raise ValueError("all input array dimensions except for the "
+                             "concatenation axis must match exactly")
+        if not np.can_cast(chunk.dtype, self._dtype, self._casting):
+            raise ValueError("cannot cast chunk of dtype {} to {}; pass "
+                             "dtype".format(chunk.dtype, self._dtype))
+
+        size = chunk.shape[axis]
+        if self._memmap is not None:
+            if self.written + size > self.length:
+                raise ValueError("chunks exceed length {}".format(
+                    self.length))
+            index = [slice(None)] * chunk.ndim
+            index[axis] = slice(self.written, self.written + size)
+            self._memmap[tuple(index)] = chunk
+        else:
+            self._file.write(np.ascontiguousarray(
+                chunk, dtype=self._dtype).tobytes())
+        self.written += size
+
+    def close(self, check=True):
+        """
+        Finishes the file, writing the final shape into the header.
+
+        Raises:
+            ValueError: (when check) if no chunk was written, or the
+                        chunks fall short of length, in which case the
+                        incomplete file is removed
+        """
+        if check and self._shape is None:
+            raise ValueError("need at least one array to concatenate")
+        if self._file is not None:
+            shape = list(self._shape)
+            shape[0] = self.written
+            self._file.seek(0)
+            self._file.write(self._header(shape))
+            self._file.close()
+            self._file = None
+        if self._memmap is not None:
+            self._memmap.flush()
+            self._memmap = None
+            if check and self.written != self.length:
+                os.remove(self.path)
+                raise ValueError("chunks fill {} of length {}".format(
+                    self.written, self.length))
+
+    def result(self):
+        """Read-only memory map of the finished file."""
+        if self._shape is None:
+            raise ValueError("need at least one array to concatenate")
+        return np.load(self.path, mmap_mode="r")
@@ -7,15 +7,19 @@ matrix multiplication using NumPy.
 import numpy as np
 
 
-def np_matmul(mat1, mat2):
+def np_matmul(mat1, mat2, out=None):
     """
     Performs matrix multiplication on two NumPy arrays.
 
     Args:
         mat1 (numpy.ndarray): First matrix
         mat2 (numpy.ndarray): Second matrix
+        out (numpy.ndarray, optional): Preallocated buffer of the
+                                       result shape to write into; it
+                                       must not overlap the inputs
 
     Returns:
-        numpy.ndarray: Result of the matrix multiplication
+        numpy.ndarray: Result of the matrix multiplication (out when
+                       given)
     """
-    return np.matmul(mat1, mat2)
+    return np.matmul(mat1, mat2, out=out)
@@ -4,6 +4,8 @@ This module contains a function matrix_shape that calculates
 the shape (dimensions) of a nested list (matrix).
 """
 
+flat = __import__('flat_matrix')
+
 
 def matrix_shape(matrix):
     """
@@ -15,7 +17,11 @@ def matrix_shape(matrix):
     Returns:
         list of int: A list of integers representing the size
                      in each dimension
+
+    A FlatMatrix answers from its cached shape without walking lists.
     """
+    if isinstance(matrix, flat.FlatMatrix):
+        return list(matrix.shape)
     shape = []
     while isinstance(matrix, list):
         shape.append(len(matrix))
@@ -4,6 +4,8 @@ This module contains a function matrix_transpose that returns
 the transpose of a 2D matrix.
 """
 
+flat = __import__('flat_matrix')
+
 
 def matrix_transpose(matrix):
     """
@@ -14,7 +16,10 @@ def matrix_transpose(matrix):
 
     Returns:
         list of lists: Transposed matrix
+        FlatMatrix: zero-copy transposed view, for FlatMatrix input
     """
+    if isinstance(matrix, flat.FlatMatrix):
+        return matrix.T
     transposed = []
     # Loop over columns of the original matrix
     for i in range(len(matrix[0])):
@@ -4,6 +4,8 @@ This module contains a function add_arrays that performs
 element-wise addition of two 1D arrays (lists).
 """
 
+flat = __import__('flat_matrix')
+
 
 def add_arrays(arr1, arr2):
     """
@@ -15,8 +17,12 @@ def add_arrays(arr1, arr2):
 
     Returns:
         list: New array containing element-wise sums
+        FlatMatrix: if either input is a FlatMatrix
         None: If the arrays do not have the same length
     """
+    if flat.any_flat(arr1, arr2):
+        return flat.as_flat(arr1).add(flat.as_flat(arr2))
+
     # Check if lengths match
     if len(arr1) != len(arr2):
         return None
@@ -4,6 +4,8 @@ This module contains a function add_matrices2D that performs
 element-wise addition of two 2D matrices.
 """
 
+flat = __import__('flat_matrix')
+
 
 def add_matrices2D(mat1, mat2):
     """
@@ -15,8 +17,12 @@ def add_matrices2D(mat1, mat2):
 
     Returns:
         list of lists: New matrix containing element-wise sums
+        FlatMatrix: if either input is a FlatMatrix
         None: If the matrices do not have the same shape
     """
+    if flat.any_flat(mat1, mat2):
+        return flat.as_flat(mat1).add(flat.as_flat(mat2))
+
     # Check if the number of rows is the same
     if len(mat1) != len(mat2):
         return None
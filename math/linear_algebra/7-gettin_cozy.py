@@ -6,6 +6,8 @@ This module contains a function cat_matrices2D that concatenates
 two 2D matrices along a specified axis.
 """
 
+flat = __import__('flat_matrix')
+
 
 def cat_matrices2D(mat1, mat2, axis=0):
     """
@@ -18,8 +20,12 @@ def cat_matrices2D(mat1, mat2, axis=0):
 
     Returns:
         list of lists: New concatenated matrix
+        FlatMatrix: if either input is a FlatMatrix
         None: If the matrices cannot be concatenated or axis is invalid
     """
+    if flat.any_flat(mat1, mat2):
+        return flat.as_flat(mat1).concatenate(flat.as_flat(mat2), axis)
+
     # Axis 0: concatenate rows
     if axis == 0:
         # Check that number of columns matches
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark of matrix_kernel.mat_mul against 8-ridin_bareback.mat_mul
+
+Times square float products from 64 to 1024. The naive triple loop is
+only timed up to NAIVE_MAX unless --all is given (1024 takes minutes).
+Pass --processes N to also time the multiprocessing split.
+"""
+
+import random
+import sys
+import time
+
+naive_mat_mul = __import__('8-ridin_bareback').mat_mul
+kernel = __import__('matrix_kernel')
+
+SIZES = [64, 128, 256, 512, 1024]
+NAIVE_MAX = 256
+
+
+def timed(fn, *args, **kwargs):
+    """
+    Returns the wall time in seconds of a single call to fn
+    """
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Prints one line per size with the time of each implementation
+    """
+    processes = None
+    if "--processes" in sys.argv:
+        processes = int(sys.argv[sys.argv.index("--processes") + 1])
+    naive_max = max(SIZES) if "--all" in sys.argv else NAIVE_MAX
+    random.seed(0)
+    print("{:>5} {:>10} {:>10} {:>10}".format(
+        "n", "naive", "kernel", "parallel"))
+    for n in SIZES:
+        mat1 = [[random.random() for _ in range(n)] for _ in range(n)]
+        mat2 = [[random.random() for _ in range(n)] for _ in range(n)]
+        if n <= naive_max:
+            t_naive = "{:10.3f}".format(timed(naive_mat_mul, mat1, mat2))
+        else:
+            t_naive = "{:>10}".format("skipped")
+        t_kernel = timed(kernel.mat_mul, mat1, mat2)
+        if processes:
+            t_par = "{:10.3f}".format(timed(kernel.mat_mul, mat1, mat2,
+                                            processes=processes))
+        else:
+            t_par = "{:>10}".format("-")
+        print("{:>5} {} {:10.3f} {}".format(n, t_naive, t_kernel, t_par))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Peak-RSS benchmark of the out= buffers of the numpy helpers
+
+Each case fills preallocated destination arrays, as a pipeline writing
+into its result storage would, on N x N float64 inputs in a fresh
+subprocess, and reports that process's peak resident set size: once
+assigning freshly allocated results into the destination, once passing
+the destination as out=. np_transpose and np_slice already return views
+and are not listed.
+"""
+
+import resource
+import subprocess
+import sys
+
+import numpy as np
+
+np_elementwise = __import__('12-bracin_the_elements').np_elementwise
+np_cat = __import__('13-cats_got_your_tongue').np_cat
+np_matmul = __import__('14-saddle_up').np_matmul
+
+N = 3000
+CASES = ["elementwise", "inplace", "cat", "matmul"]
+
+
+def run(case, buffered):
+    """
+    Runs one case in this process
+    """
+    a = np.random.rand(N, N)
+    b = np.random.rand(N, N) + 1.0
+    if case == "elementwise":
+        dest = tuple(np.empty((N, N)) for _ in range(4))
+        if buffered:
+            np_elementwise(a, b, out=dest)
+        else:
+            for buf, result in zip(dest, np_elementwise(a, b)):
+                buf[...] = result
+    elif case == "inplace":
+        # the quotient overwrites a, the other three are kept
+        dest = tuple(np.empty((N, N)) for _ in range(3))
+        if buffered:
+            np_elementwise(a, b, out=dest + (a,))
+        else:
+            results = np_elementwise(a, b)
+            for buf, result in zip(dest, results):
+                buf[...] = result
+            a[...] = results[3]
+    elif case == "cat":
+        dest = np.empty((2 * N, N))
+        if buffered:
+            np_cat(a, b, out=dest)
+        else:
+            dest[...] = np_cat(a, b)
+    elif case == "matmul":
+        dest = np.empty((N, N))
+        if buffered:
+            np_matmul(a, b, out=dest)
+        else:
+            dest[...] = np_matmul(a, b)
+
+
+def peak_rss_mb(case, buffered):
+    """
+    Peak RSS in MB of one case, measured in a fresh subprocess
+    """
+    flag = "buffered" if buffered else "fresh"
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--case", case, flag])
+    return float(output.decode().strip())
+
+
+def main():
+    """
+    Prints peak RSS per case with fresh results and with out= buffers
+    """
+    if "--case" in sys.argv:
+        case = sys.argv[sys.argv.index("--case") + 1]
+        run(case, "buffered" in sys.argv)
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        print(usage.ru_maxrss / 1024.0)
+        return
+    print("{:>12} {:>12} {:>12}".format("case", "fresh MB", "out= MB"))
+    for case in CASES:
+        print("{:>12} {:12.1f} {:12.1f}".format(
+            case, peak_rss_mb(case, False), peak_rss_mb(case, True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+This module defines FlatMatrix, a compact N-d matrix backed by one
+flat array.array with a cached shape and strides. Integers that do not
+fit in int64 are kept exact in a plain list instead, as the nested
+lists keep them.
+
+Transposes and slices are views: they share the parent's buffer and
+only carry a new shape, strides and offset, so no element is copied.
+The list helpers in this directory (matrix_shape, matrix_transpose,
+add_arrays, add_matrices2D, cat_matrices2D, add_matrices and
+cat_matrices) accept a FlatMatrix wherever they accept a nested list.
+"""
+
+from array import array
+from operator import add
+
+
+def _contiguous_strides(shape):
+    """Row-major strides (in elements) for a shape."""
+    strides = []
+    step = 1
+    for dim in reversed(shape):
+        strides.append(step)
+        step *= dim
+    return tuple(reversed(strides))
+
+
+def _buffer(typecode, values):
+    """
+    Flat buffer of values for typecode 'q', 'd' or 'O'.
+
+    'q' values that overflow int64, and 'O', go in a plain list so
+    they stay exact Python ints.
+    """
+    if typecode == "d":
+        return array("d", values)
+    values = list(values)
+    if typecode == "q":
+        try:
+            return array("q", values)
+        except OverflowError:
+            pass
+    return values
+
+
+def _result_typecode(*typecodes):
+    """Typecode of a combination: 'd' if any input is, else 'q'."""
+    return "d" if "d" in typecodes else "q"
+
+
+def _size(shape):
+    """Number of elements in a shape."""
+    size = 1
+    for dim in shape:
+        size *= dim
+    return size
+
+
+class FlatMatrix:
+    """
+    N-d matrix stored in a single flat array.array (or list).
+
+    Attributes:
+        shape (tuple): size of each dimension
+        strides (tuple): step in the flat buffer for each dimension
+    """
+
+    __slots__ = ("_data", "_shape", "_strides", "_offset")
+
+    def __init__(self, data, shape, strides=None, offset=0):
+        """
+        Wraps an existing flat buffer (no copy).
+
+        Args:
+            data (array.array or list): flat element buffer
+            shape (tuple): size of each dimension
+            strides (tuple): element step per dimension, row-major
+                contiguous when None
+            offset (int): index in data of the first element
+        """
+        self._data = data
+        self._shape = tuple(shape)
+        self._strides = (_contiguous_strides(self._shape)
+                         if strides is None else tuple(strides))
+        self._offset = offset
+
+    @classmethod
+    def from_list(cls, matrix):
+        """
+        Builds a contiguous FlatMatrix from a (nested) list.
+
+        Integer lists are stored with typecode 'q' so they stay ints
+        (in a plain list, typecode 'O', when one does not fit in
+        int64); anything else is stored as 'd'.
+        """
+        shape = []
+        level = matrix
+        while isinstance(level, list):
+            shape.append(len(level))
+            if not level:
+                break
+            level = level[0]
+        values = matrix
+        for _ in range(len(shape) - 1):
+            values = [x for sub in values for x in sub]
+        if len(values) != _size(shape):
+            raise ValueError("matrix must not be ragged")
+        typecode = "q" if all(type(x) is int for x in values) else "d"
+        return cls(_buffer(typecode, values), shape)
+
+    @property
+    def shape(self):
+        """Size of each dimension."""
+        return self._shape
+
+    @property
+    def strides(self):
+        """Step in the flat buffer for each dimension."""
+        return self._strides
+
+    @property
+    def ndim(self):
+        """Number of dimensions."""
+        return len(self._shape)
+
+    @property
+    def size(self):
+        """Number of elements."""
+        return _size(self._shape)
+
+    @property
+    def typecode(self):
+        """array.array typecode of the buffer, 'O' for a list."""
+        return getattr(self._data, "typecode", "O")
+
+    def is_contiguous(self):
+        """Whether the view covers its buffer in row-major order."""
+        return self._strides == _contiguous_strides(self._shape)
+
+    def __len__(self):
+        """Size of the first dimension."""
+        return self._shape[0]
+
+    def __repr__(self):
+        """FlatMatrix(<nested list>)."""
+        return "FlatMatrix({!r})".format(self.tolist())
+
+    def __eq__(self, other):
+        """Same shape and same elements."""
+        if not isinstance(other, FlatMatrix):
+            return NotImplemented
+        return (self._shape == other._shape and
+                list(self.values()) == list(other.values()))
+
+    def transpose(self):
+        """View with the order of the dimensions reversed (no copy)."""
+        return FlatMatrix(self._data, self._shape[::-1],
+                          self._strides[::-1], self._offset)
+
+    @property
+    def T(self):
+        """Transposed view."""
+        return self.transpose()
+
+    def __getitem__(self, key):
+        """
+        Indexes with ints and slices, one per leading dimension.
+
+        Ints drop their dimension and slices keep it; the result is a
+        view on the same buffer, or an element when every dimension is
+        indexed by an int.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > len(self._shape):
+            raise IndexError("too many indices")
+        offset = self._offset
+        shape = []
+        strides = []
+        for axis, (dim, stride) in enumerate(zip(self._shape,
+                                                 self._strides)):
+            if axis >= len(key):
+                shape.append(dim)
+                strides.append(stride)
+                continue
+            index = key[axis]
+            if isinstance(index, slice):
+                start, stop, step = index.indices(dim)
+                shape.append(len(range(start, stop, step)))
+                strides.append(stride * step)
+                offset += start * stride
+            else:
+                if index < 0:
+                    index += dim
+                if not 0 <= index < dim:
+                    raise IndexError("index out of range")
+                offset += index * stride
+        if not shape:
+            return self._data[offset]
+        return FlatMatrix(self._data, shape, strides, offset)
+
+    def __iter__(self):
+        """Iterates over the first dimension (views or elements)."""
+        for i in range(self._shape[0]):
+            yield self[i]
+
+    def values(self):
+        """Iterates over every element in row-major order."""
+        if self.is_contiguous():
+            return iter(self._data[self._offset:self._offset + self.size])
+        return self._walk(0, self._offset)
+
+    def _walk(self, axis, offset):
+        """Generator over the elements below one axis of a view."""
+        stride = self._strides[axis]
+        if axis == len(self._shape) - 1:
+            for i in range(self._shape[axis]):
+                yield self._data[offset + i * stride]
+            return
+        for i in range(self._shape[axis]):
+            yield from self._walk(axis + 1, offset + i * stride)
+
+    def copy(self):
+        """Contiguous copy with its own buffer."""
+        return FlatMatrix(_buffer(self.typecode, self.values()),
+                          self._shape)
+
+    def tolist(self):
+        """Nested list with the same shape and elements."""
+        items = list(self.values())
+        for dim in reversed(self._shape[1:]):
+            items = [items[i:i + dim] for i in range(0, len(items), dim)]
+        return items
+
+    def add(self, other):
+        """
+        Element-wise sum with a FlatMatrix of the same shape.
+
+        Returns:
+            FlatMatrix: new contiguous matrix, or None if the shapes
+            differ
+        """
+        if self._shape != other._shape:
+            return None
+        typecode = _result_typecode(self.typecode, other.typecode)
+        return FlatMatrix(_buffer(typecode, map(add, self.values(),
+                                                other.values())),
+                          self._shape)
+
+    def concatenate(self, other, axis=0):
+        """
+        Joins with a FlatMatrix along axis.
+
+        Returns:
+            FlatMatrix: new contiguous matrix, or None if the shapes
+            differ outside axis
+        """
+        if (len(self._shape) != len(other._shape) or
+                not 0 <= axis < len(self._shape)):
+            return None
+        for i, (d1, d2) in enumerate(zip(self._shape, other._shape)):
+            if i != axis and d1 != d2:
+                return None
+        a = list(self.values())
+        b = list(other.values())
+        chunk_a = _size(self._shape[axis:])
+        chunk_b = _size(other._shape[axis:])
+        out = []
+        for outer in range(_size(self._shape[:axis])):
+            out.extend(a[outer * chunk_a:(outer + 1) * chunk_a])
+            out.extend(b[outer * chunk_b:(outer + 1) * chunk_b])
+        shape = list(self._shape)
+        shape[axis] += other._shape[axis]
+        typecode = _result_typecode(self.typecode, other.typecode)
+        return FlatMatrix(_buffer(typecode, out), shape)
+
+
+def as_flat(matrix):
+    """
+    Returns matrix as a FlatMatrix, converting a nested list.
+    """
+    if isinstance(matrix, FlatMatrix):
+        return matrix
+    return FlatMatrix.from_list(matrix)
+
+
+def any_flat(*matrices):
+    """
+    Whether any argument is a FlatMatrix.
+    """
+    return any(isinstance(m, FlatMatrix) for m in matrices)
+
+
+def concatenate_many(matrices, axis=0):
+    """
+    Joins FlatMatrix objects of matching shape (outside axis) along
+    axis into one new contiguous FlatMatrix, whose buffer is built
+    once.
+    """
+    first = matrices[0].shape
+    shape = list(first)
+    shape[axis] = sum(m.shape[axis] for m in matrices)
+    typecode = _result_typecode(*(m.typecode for m in matrices))
+    chunks = [(list(m.values()), _size(m.shape[axis:])) for m in matrices]
+    out = []
+    for outer in range(_size(first[:axis])):
+        for values, chunk in chunks:
+            out.extend(values[outer * chunk:(outer + 1) * chunk])
+    out = _buffer(typecode, out)
+    return FlatMatrix(out, shape)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+This module contains a pure-Python matrix engine for list matrices
+that does not need numpy.
+
+Matrices are stored as flat row-major array('d') buffers. Products
+multiply against the transpose of the right operand, so every dot
+product walks two contiguous rows, and the output is computed in
+row/column tiles so a tile of transposed rows stays hot while it is
+reused. Large products can split their row blocks across a
+multiprocessing pool.
+"""
+
+import math
+from array import array
+from multiprocessing import Pool
+from operator import mul
+
+_shared = {}
+
+
+def _sum_of_products(a, b):
+    """
+    Dot product of two equal-length sequences.
+    """
+    return sum(map(mul, a, b))
+
+
+# math.sumprod (Python 3.12+) does the whole dot product in C
+_dot = getattr(math, "sumprod", _sum_of_products)
+
+
+def to_flat(matrix):
+    """
+    Packs a 2D list matrix into flat row-major storage.
+
+    Args:
+        matrix (list of lists): Input matrix
+
+    Returns:
+        tuple: (array('d') data, rows, cols)
+    """
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows else 0
+    data = array('d')
+    for row in matrix:
+        data.extend(row)
+    return data, rows, cols
+
+
+def to_lists(data, rows, cols):
+    """
+    Unpacks flat row-major storage into a 2D list matrix.
+    """
+    return [data[i * cols:(i + 1) * cols].tolist() for i in range(rows)]
+
+
+def transpose_flat(data, rows, cols):
+    """
+    Transposes flat row-major storage.
+
+    Returns:
+        array('d'): the (cols x rows) transpose, row-major
+    """
+    out = array('d', bytes(8 * rows * cols))
+    for i in range(rows):
+        out[i::rows] = data[i * cols:(i + 1) * cols]
+    return out
+
+
+def _mul_rows(a, bt, n, p, start, stop, block):
+    """
+    Rows start..stop of A times B, with B given transposed.
+
+    Args:
+        a (array): A, flat row-major with n columns
+        bt (array): B transposed, flat row-major with n columns
+        n (int): inner dimension
+        p (int): number of columns of B
+        start, stop (int): row range of A to compute
+        block (int): tile size in rows and columns
+
+    Returns:
+        array('d'): the (stop - start) x p block of the product
+    """
+    out = array('d', bytes(8 * (stop - start) * p))
+    a_view = memoryview(a)
+    bt_view = memoryview(bt)
+    bt_rows = [bt_view[j * n:(j + 1) * n] for j in range(p)]
+    for ii in range(start, stop, block):
+        i_stop = min(ii + block, stop)
+        a_rows = [a_view[i * n:(i + 1) * n] for i in range(ii, i_stop)]
+        for jj in range(0, p, block):
+            j_stop = min(jj + block, p)
+            tile = bt_rows[jj:j_stop]
+            for offset, a_row in enumerate(a_rows):
+                base = (ii - start + offset) * p + jj
+                for k, bt_row in enumerate(tile):
+                    out[base + k] = _dot(a_row, bt_row)
+    return out
+
+
+def _init_worker(a, bt, n, p, block):
+    """
+    Stores the operands once per worker process.
+    """
+    _shared.update(a=a, bt=bt, n=n, p=p, block=block)
+
+
+def _worker(bounds):
+    """
+    Computes one row block in a worker process.
+    """
+    return _mul_rows(_shared["a"], _shared["bt"], _shared["n"],
+                     _shared["p"], bounds[0], bounds[1], _shared["block"])
+
+
+def mat_mul_flat(a, m, n, b, p, block=64, processes=None):
+    """
+    Multiplies flat row-major matrices A (m x n) and B (n x p).
+
+    Args:
+        a (array): A, flat row-major
+        m, n (int): shape of A
+        b (array): B, flat row-major
+        p (int): number of columns of B
+        block (int): tile size in rows and columns
+        processes (int): worker processes to split row blocks over;
+            None or 1 computes in this process
+
+    Returns:
+        array('d'): the m x p product, flat row-major
+    """
+    bt = transpose_flat(b, n, p)
+    if not processes or processes < 2 or m <= block:
+        return _mul_rows(a, bt, n, p, 0, m, block)
+
+    step = max(block, -(-m // processes))
+    bounds = [(i, min(i + step, m)) for i in range(0, m, step)]
+    with Pool(processes, _init_worker, (a, bt, n, p, block)) as pool:
+        parts = pool.map(_worker, bounds)
+    out = array('d')
+    for part in parts:
+        out.extend(part)
+    return out
+
+
+def mat_mul(mat1, mat2, block=64, processes=None):
+    """
+    Multiplies two 2D list matrices.
+
+    Integer matrices are multiplied with exact int arithmetic on
+    transposed rows; anything else goes through the flat array('d')
+    kernel.
+
+    Args:
+        mat1 (list of lists): First matrix (m x n)
+        mat2 (list of lists): Second matrix (n x p)
+        block (int): tile size in rows and columns
+        processes (int): worker processes for large float products
+
+    Returns:
+        list of lists: Resulting matrix (m x p)
+        None: If the matrices cannot be multiplied
+    """
+    if len(mat1[0]) != len(mat2):
+        return None
+
+    if all(type(x) is int for mat in (mat1, mat2)
+           for row in mat for x in row):
+        cols = list(zip(*mat2))
+        return [[_dot(row, col) for col in cols] for row in mat1]
+
+    a, m, n = to_flat(mat1)
+    b, _, p = to_flat(mat2)
+    return to_lists(mat_mul_flat(a, m, n, b, p, block, processes), m, p)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark of array pdf/pmf/cdf calls against a Python loop of scalar
+calls at 1e6 points
+
+The loop is timed on LOOP_POINTS points and scaled up to POINTS unless
+--all is given (the discrete cdf loops take minutes at 1e6).
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+Normal = __import__('normal').Normal
+Exponential = __import__('exponential').Exponential
+Poisson = __import__('poisson').Poisson
+Binomial = __import__('binomial').Binomial
+
+POINTS = 10 ** 6
+LOOP_POINTS = 10 ** 5
+
+
+def timed(fn, *args):
+    """
+    Returns the wall time in seconds of a single call to fn
+    """
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Prints the loop and array time of every method
+    """
+    loop_points = POINTS if "--all" in sys.argv else LOOP_POINTS
+    random.seed(0)
+    reals = [random.uniform(-5, 15) for _ in range(POINTS)]
+    counts = [random.randint(-2, 60) for _ in range(POINTS)]
+    cases = [(Normal(mean=5., stddev=3.), ("pdf", "cdf"), reals),
+             (Exponential(lambtha=0.5), ("pdf", "cdf"), reals),
+             (Poisson(lambtha=20.), ("pmf", "cdf"), counts),
+             (Binomial(n=50, p=0.4), ("pmf", "cdf"), counts)]
+    print("{:>18} {:>10} {:>10} {:>8}".format(
+        "method", "loop", "array", "speedup"))
+    for dist, methods, values in cases:
+        array = np.array(values)
+        for name in methods:
+            method = getattr(dist, name)
+            t_loop = timed(lambda: [method(v) for v in
+                                    values[:loop_points]])
+            t_loop *= POINTS / loop_points
+            t_array = timed(method, array)
+            print("{:>18} {:10.3f} {:10.4f} {:7.0f}x".format(
+                type(dist).__name__ + "." + name, t_loop, t_array,
+                t_loop / t_array))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,19 @@ The binomial distribution models the number of successes
 independent Bernoulli trials.
 """
 
+import math
+
+# Below this log(PMF(0)) = n * log(1 - p), (1 - p)^n underflows and the
+# pmf recurrence runs on logarithms
+_LOG_SPACE_LOG_Q_N = -700
+
+
+def _is_array(x):
+    """
+    Whether x is a list, tuple or array of values rather than one value
+    """
+    return isinstance(x, (list, tuple)) or getattr(x, "ndim", 0) > 0
+
 
 class Binomial:
     """
@@ -18,13 +31,16 @@ class Binomial:
         p (float): The probability of success on each trial
     """
 
-    def __init__(self, data=None, n=1, p=0.5):
+    def __init__(self, data=None, n=1, p=0.5, cache=False):
         """
         Initialize a Binomial distribution.
         Args:
             data (list, optional): List of data to estimate the distribution.
             n (int, optional): Number of Bernoulli trials. Default is 1.
             p (float, optional): Probability of success. Default is 0.5.
+            cache (bool, optional): Keep the PMF/CDF tables that cdf
+                builds, so later queries up to the largest k seen are
+                lookups. Default is False.
         Raises:
             TypeError: If data is not a list
             ValueError: If n is not positive, p is not a valid probability,
@@ -59,6 +75,11 @@ class Binomial:
             self.n = round(n)
             # Recalculate p with the rounded n
             self.p = mean / self.n
+        self.cache = cache
+        self._tables_for = None
+        self._pmfs = []
+        self._cdfs = []
+        self._log_term = None
 
     def pmf(self, k):
         """
@@ -67,10 +88,13 @@ class Binomial:
         Formula: PMF(k) = C(n,k) * p^k * (1-p)^(n-k)
         where C(n,k) is the binomial coefficient "n choose k"
         Args:
-            k (int): Number of successes
+            k (int, list or numpy.ndarray): Number of successes; a list
+                or array gives an array of PMFs
         Returns:
             float: The PMF value for k, or 0 if k is out of range
         """
+        if _is_array(k):
+            return self._lookup(k, self._pmf_table, 0)
         # Convert k to integer if needed
         k = int(k)
         # Check if k is out of range
@@ -85,20 +109,33 @@ class Binomial:
         p_power_k = self.p ** k
         # Calculate (1-p)^(n-k)
         q_power_n_minus_k = (1 - self.p) ** (self.n - k)
-        # PMF = C(n,k) * p^k * (1-p)^(n-k)
-        pmf_value = binomial_coeff * p_power_k * q_power_n_minus_k
+        try:
+            # PMF = C(n,k) * p^k * (1-p)^(n-k)
+            pmf_value = binomial_coeff * p_power_k * q_power_n_minus_k
+        except OverflowError:
+            # C(n,k) is past the float range: use log space
+            pmf_value = math.exp(
+                math.lgamma(self.n + 1) - math.lgamma(k + 1) -
+                math.lgamma(self.n - k + 1) + k * math.log(self.p) +
+                (self.n - k) * math.log(1 - self.p))
         return pmf_value
 
     def cdf(self, k):
         """
         Calculate the Cumulative Distribution Function (CDF)
         The CDF gives the probability of getting at most k
-        Formula: CDF(k) = sum of PMF(i) for i = 0 to k
+        Formula: CDF(k) = sum of PMF(i) for i = 0 to k, with the
+        PMFs from the recurrence
+        PMF(i + 1) = PMF(i) * (n - i) / (i + 1) * p / (1 - p)
+        (see _tables), O(k) in all and a lookup when cached
         Args:
-            k (int): Number of successes
+            k (int, list or numpy.ndarray): Number of successes; a list
+                or array gives an array of CDFs
         Returns:
             float: The CDF value for k, or 0 if k is out of range
         """
+        if _is_array(k):
+            return self._lookup(k, self._cdf_table, None)
         # Convert k to integer if needed
         k = int(k)
         # Check if k is out of range
@@ -108,7 +145,86 @@ class Binomial:
         if k >= self.n:
             k = self.n
         # CDF is the sum of PMF values from 0 to k
-        cdf_value = 0
-        for i in range(k + 1):
-            cdf_value += self.pmf(i)
-        return cdf_value
+        return self._tables(k + 1)[1][k]
+
+    def _tables(self, size):
+        """
+        PMF and CDF lists of 0 .. size - 1 (size <= n + 1)
+
+        Each PMF comes from the previous one by the ratio recurrence
+        PMF(i + 1) = PMF(i) * (n - i) / (i + 1) * p / (1 - p), starting
+        from PMF(0) = (1 - p)^n, one multiply per term instead of a
+        binomial coefficient and two powers. When (1 - p)^n underflows
+        the terms are carried as logarithms instead. With cache they
+        are kept on the instance (for the n and p they were built with)
+        and only ever extended. For p = 1 (e.g. estimated from constant
+        data) or p = 0 all the mass is at n or at 0.
+        """
+        n, p = self.n, self.p
+        q = 1 - p
+        if self.cache and self._tables_for == (n, p):
+            pmfs, cdfs, log_term = self._pmfs, self._cdfs, self._log_term
+        else:
+            pmfs, cdfs, log_term = [], [], None
+        # The logs below are undefined when p is 0 or 1
+        degenerate = p == 0 or q == 0
+        if not degenerate:
+            log_space = n * math.log(q) < _LOG_SPACE_LOG_Q_N
+            log_odds = math.log(p / q)
+        total = cdfs[-1] if cdfs else 0
+        i = len(pmfs)
+        while i < size:
+            if degenerate:
+                term = 1.0 if i == (n if q == 0 else 0) else 0.0
+            elif i == 0:
+                log_term = n * math.log(q)
+                term = q ** n
+            elif log_space:
+                log_term += math.log((n - i + 1) / i) + log_odds
+                term = math.exp(log_term)
+            else:
+                term = pmfs[-1] * (n - i + 1) / i * p / q
+            total += term
+            pmfs.append(term)
+            cdfs.append(total)
+            i += 1
+        if self.cache:
+            self._tables_for = (n, p)
+            self._pmfs, self._cdfs, self._log_term = pmfs, cdfs, log_term
+        return pmfs, cdfs
+
+    def _pmf_table(self, size):
+        """
+        PMF of 0 .. size - 1 as a numpy array, from _tables
+        """
+        import numpy as np
+        return np.array(self._tables(size)[0][:size])
+
+    def _cdf_table(self, size):
+        """
+        CDF of 0 .. size - 1 as a numpy array, from _tables, so the
+        values are those of the scalar cdf
+        """
+        import numpy as np
+        return np.array(self._tables(size)[1][:size])
+
+    def _lookup(self, k, table, above):
+        """
+        Evaluates a PMF/CDF table at every k of a list or array
+
+        Each k is truncated to an int like the scalar methods and the
+        table is built once up to the largest k needed, at most n. k < 0
+        gives 0; k > n gives above, or the value at n when above is None.
+        """
+        import numpy as np
+        k = np.asarray(k).astype(np.int64)
+        result = np.zeros(k.shape)
+        valid = k >= 0
+        if valid.any():
+            values = table(min(int(k.max()), self.n) + 1)
+            last = len(values) - 1
+            k = k[valid]
+            result[valid] = np.where(k > last,
+                                     values[last] if above is None else above,
+                                     values[np.minimum(k, last)])
+        return result
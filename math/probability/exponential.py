@@ -6,6 +6,13 @@ The exponential distribution models the time
 """
 
 
+def _is_array(x):
+    """
+    Whether x is a list, tuple or array of values rather than one value
+    """
+    return isinstance(x, (list, tuple)) or getattr(x, "ndim", 0) > 0
+
+
 class Exponential:
     """
     Represents an exponential distribution.
@@ -45,10 +52,19 @@ class Exponential:
         The PDF gives the relative likelihood for the
         Formula: PDF(x) = lambtha * e^(-lambtha * x)
         Args:
-            x (float): Time period
+            x (float, list or numpy.ndarray): Time period; a list or
+                array gives an array of PDFs
         Returns:
             float: The PDF value for x, or 0 if x is out of range
         """
+        if _is_array(x):
+            import numpy as np
+            x = np.asarray(x, dtype=float)
+            pdf_value = np.zeros(x.shape)
+            valid = x >= 0
+            pdf_value[valid] = self.lambtha * np.power(
+                2.7182818285, -self.lambtha * x[valid])
+            return pdf_value
         # Check if x is out of range (negative)
         if x < 0:
             return 0
@@ -66,10 +82,19 @@ class Exponential:
         equal to a certain value x.
         Formula: CDF(x) = 1 - e^(-lambtha * x)
         Args:
-            x (float): Time period
+            x (float, list or numpy.ndarray): Time period; a list or
+                array gives an array of CDFs
         Returns:
             float: The CDF value for x, or 0 if x is out of range
         """
+        if _is_array(x):
+            import numpy as np
+            x = np.asarray(x, dtype=float)
+            cdf_value = np.zeros(x.shape)
+            valid = x >= 0
+            cdf_value[valid] = 1 - np.power(2.7182818285,
+                                            -self.lambtha * x[valid])
+            return cdf_value
         # Check if x is out of range (negative)
         if x < 0:
             return 0
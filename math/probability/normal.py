@@ -6,6 +6,13 @@ The normal distribution is the most probability
 """
 
 
+def _is_array(x):
+    """
+    Whether x is a list, tuple or array of values rather than one value
+    """
+    return isinstance(x, (list, tuple)) or getattr(x, "ndim", 0) > 0
+
+
 class Normal:
     """
     Represents a normal (Gaussian) distribution.
@@ -77,13 +84,17 @@ class Normal:
         a given value.
         Formula: PDF(x) = (1 / (stddev * sqrt(2*pi)))
         Args:
-            x (float): The x-value
+            x (float, list or numpy.ndarray): The x-value; a list or
+                array gives an array of PDFs
         Returns:
             float: The PDF value for x
         """
         # Constants
         pi = 3.1415926536
         e = 2.7182818285
+        if _is_array(x):
+            import numpy as np
+            x = np.asarray(x, dtype=float)
         # Calculate the coefficient: 1 / (stddev * sqrt(2*pi))
         coefficient = 1 / (self.stddev * (2 * pi) ** 0.5)
         # Calculate the exponent: -0.5 * ((x - mean) / stddev)^2
@@ -101,12 +112,15 @@ class Normal:
         Formula: CDF(x) = 0.5 * (1 + erf((x - mean) /
         where erf is the error function
         Args:
-            x (float): The x-value
+            x (float, list or numpy.ndarray): The x-value; a list or
+                array gives an array of CDFs
         Returns:
             float: The CDF value for x
         """
         # Constants
         pi = 3.1415926536
+        if _is_array(x):
+            return self._cdf_array(x)
         # Calculate z-score for error function
         z = (x - self.mean) / (self.stddev * (2 ** 0.5))
         # Calculate error function using Abramowitz and Stegu
@@ -132,3 +146,25 @@ class Normal:
         # CDF = 0.5 * (1 + erf(z))
         cdf_value = 0.5 * (1 + erf_value)
         return cdf_value
+
+    def _cdf_array(self, x):
+        """
+        cdf of every value of a list or array, with the same erf
+        approximation and constants as the scalar cdf
+        """
+        import numpy as np
+        x = np.asarray(x, dtype=float)
+        z = (x - self.mean) / (self.stddev * (2 ** 0.5))
+        a1 = 0.254829592
+        a2 = -0.284496736
+        a3 = 1.421413741
+        a4 = -1.453152027
+        a5 = 1.061405429
+        p = 0.3275911
+        sign = np.where(z >= 0, 1, -1)
+        z = np.abs(z)
+        t = 1.0 / (1.0 + p * z)
+        e = 2.7182818285
+        poly = (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t
+        y = 1.0 - poly * (e ** (-z * z))
+        return 0.5 * (1 + sign * y)
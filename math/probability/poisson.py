@@ -6,6 +6,19 @@ The Poisson distribution models the probability of a
 occurring in a fixed interval of time or space.
 """
 
+import math
+
+# Past this lambtha, e^(-lambtha) underflows and the pmf recurrence
+# runs on logarithms
+_LOG_SPACE_LAMBTHA = 700
+
+
+def _is_array(x):
+    """
+    Whether x is a list, tuple or array of values rather than one value
+    """
+    return isinstance(x, (list, tuple)) or getattr(x, "ndim", 0) > 0
+
 
 class Poisson:
     """
@@ -17,12 +30,15 @@ class Poisson:
         lambtha (float): The expected number of occurrences
     """
 
-    def __init__(self, data=None, lambtha=1.):
+    def __init__(self, data=None, lambtha=1., cache=False):
         """
         Initialize a Poisson distribution.
         Args:
             data (list, optional): List of data to estimate the distribution.
             lambtha (float, optional): Expected number of occurrences.
+            cache (bool, optional): Keep the PMF/CDF tables that cdf
+                builds, so later queries up to the largest k seen are
+                lookups. Default is False.
         Raises:
             TypeError: If data is not a list
             ValueError: If lambtha is not positive or data has fewer than
@@ -40,6 +56,11 @@ class Poisson:
                 raise ValueError("data must contain multiple values")
             # Lambtha is the mean of the data for Poisson distribution
             self.lambtha = float(sum(data) / len(data))
+        self.cache = cache
+        self._tables_for = None
+        self._pmfs = []
+        self._cdfs = []
+        self._log_term = None
 
     def pmf(self, k):
         """
@@ -48,26 +69,34 @@ class Poisson:
         equal to some value k.
         Formula: PMF(k) = (lambtha^k * e^(-lambtha)) / k!
         Args:
-            k (int): Number of successes (occurrences)
+            k (int, list or numpy.ndarray): Number of successes
+                (occurrences); a list or array gives an array of PMFs
         Returns:
             float: The PMF value for k, or 0 if k is out of range
         """
+        if _is_array(k):
+            return self._lookup(k, self._pmf_table, 0)
         # Convert k to integer if needed
         k = int(k)
         # Check if k is out of range (negative)
         if k < 0:
             return 0
-        # Calculate e^(-lambtha)
-        e = 2.7182818285
-        exp_neg_lambtha = e ** (-self.lambtha)
-        # Calculate lambtha^k
-        lambtha_power_k = self.lambtha ** k
-        # Calculate k! (factorial)
-        k_factorial = 1
-        for i in range(1, k + 1):
-            k_factorial *= i
-        # PMF = (lambtha^k * e^(-lambtha)) / k!
-        pmf_value = (lambtha_power_k * exp_neg_lambtha) / k_factorial
+        try:
+            # Calculate e^(-lambtha)
+            e = 2.7182818285
+            exp_neg_lambtha = e ** (-self.lambtha)
+            # Calculate lambtha^k
+            lambtha_power_k = self.lambtha ** k
+            # Calculate k! (factorial)
+            k_factorial = 1
+            for i in range(1, k + 1):
+                k_factorial *= i
+            # PMF = (lambtha^k * e^(-lambtha)) / k!
+            pmf_value = (lambtha_power_k * exp_neg_lambtha) / k_factorial
+        except OverflowError:
+            # lambtha^k or k! is past the float range: use log space
+            pmf_value = math.exp(k * math.log(self.lambtha) -
+                                 self.lambtha - math.lgamma(k + 1))
         return pmf_value
 
     def cdf(self, k):
@@ -75,19 +104,101 @@ class Poisson:
         Calculate the Cumulative Distribution Function (CDF)
         The CDF gives the probability that a random variable is less
         to a certain value k.
-        Formula: CDF(k) = sum of PMF(i) for i = 0 to k
+        Formula: CDF(k) = sum of PMF(i) for i = 0 to k, with the
+        PMFs from the recurrence PMF(i + 1) = PMF(i) * lambtha / (i + 1)
+        (see _tables), O(k) in all and a lookup when cached
         Args:
-            k (int): Number of successes (occurrences)
+            k (int, list or numpy.ndarray): Number of successes
+                (occurrences); a list or array gives an array of CDFs
         Returns:
             float: The CDF value for k, or 0 if k is out of range
         """
+        if _is_array(k):
+            return self._lookup(k, self._cdf_table, None)
         # Convert k to integer if needed
         k = int(k)
         # Check if k is out of range (negative)
         if k < 0:
             return 0
         # CDF is the sum of PMF values from 0 to k
-        cdf_value = 0
-        for i in range(k + 1):
-            cdf_value += self.pmf(i)
-        return cdf_value
+        cdfs = self._tables(k + 1)[1]
+        return cdfs[min(k, len(cdfs) - 1)]
+
+    def _tables(self, size):
+        """
+        PMF and CDF lists of 0 .. size - 1
+
+        Each PMF comes from the previous one by the ratio recurrence
+        PMF(i + 1) = PMF(i) * lambtha / (i + 1), starting from
+        PMF(0) = e^(-lambtha), one multiply per term instead of a power
+        and a factorial. When e^(-lambtha) underflows the terms are
+        carried as logarithms instead. The lists stop early once the
+        terms past lambtha have underflowed to 0, since the CDF no
+        longer changes. With cache they are kept on the instance (for
+        the lambtha they were built with) and only ever extended.
+        """
+        lambtha = self.lambtha
+        if self.cache and self._tables_for == lambtha:
+            pmfs, cdfs, log_term = self._pmfs, self._cdfs, self._log_term
+        else:
+            pmfs, cdfs, log_term = [], [], None
+        log_space = lambtha > _LOG_SPACE_LAMBTHA
+        log_lambtha = math.log(lambtha)
+        total = cdfs[-1] if cdfs else 0
+        i = len(pmfs)
+        while i < size and not (pmfs and pmfs[-1] == 0 and i > lambtha):
+            if i == 0:
+                log_term = -lambtha
+                term = 2.7182818285 ** (-lambtha)
+            elif log_space:
+                log_term += log_lambtha - math.log(i)
+                term = math.exp(log_term)
+            else:
+                term = pmfs[-1] * lambtha / i
+            total += term
+            pmfs.append(term)
+            cdfs.append(total)
+            i += 1
+        if self.cache:
+            self._tables_for = lambtha
+            self._pmfs, self._cdfs, self._log_term = pmfs, cdfs, log_term
+        return pmfs, cdfs
+
+    def _pmf_table(self, size):
+        """
+        PMF of 0 .. size - 1 as a numpy array, from _tables, so it is
+        shorter than size when the terms have underflowed to 0
+        """
+        import numpy as np
+        return np.array(self._tables(size)[0][:size])
+
+    def _cdf_table(self, size):
+        """
+        CDF of 0 .. size - 1 as a numpy array, from _tables, so the
+        values are those of the scalar cdf; shorter than size once the
+        CDF stops changing
+        """
+        import numpy as np
+        return np.array(self._tables(size)[1][:size])
+
+    def _lookup(self, k, table, above):
+        """
+        Evaluates a PMF/CDF table at every k of a list or array
+
+        Each k is truncated to an int like the scalar methods and the
+        table is built once up to the largest k, but only allocated as
+        long as _tables runs. k < 0 gives 0; k past the table gives
+        above, or the last value of the table when above is None.
+        """
+        import numpy as np
+        k = np.asarray(k).astype(np.int64)
+        result = np.zeros(k.shape)
+        valid = k >= 0
+        if valid.any():
+            values = table(int(k.max()) + 1)
+            last = len(values) - 1
+            k = k[valid]
+            result[valid] = np.where(k > last,
+                                     values[last] if above is None else above,
+                                     values[np.minimum(k, last)])
+        return result